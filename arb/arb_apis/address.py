@@ -2,82 +2,232 @@
 Address APIs for ARB
 """
 
+from collections import defaultdict
+
 import frappe
 from frappe import _
+from frappe.utils import cint
+from pydantic import ValidationError
 
+from arb.arb_apis.schemas import CreateAddressData
+from arb.arb_apis.utils.arg_validator import validate_args
 from arb.arb_apis.utils.authentication import require_jwt_auth
+from arb.arb_apis.utils.pagination import encode_cursor, keyset_condition
+from arb.arb_apis.utils.pydantic_validator import format_validation_error
+
+MAX_ADDRESS_PAGE_LENGTH = 200
+MAX_BULK_ADDRESS_CUSTOMERS = 50
+
+# Address columns returned by the listing endpoints
+_ADDRESS_LIST_COLUMNS = """
+    a.name, a.phone, a.address_title, a.address_type,
+    a.address_line1, a.address_line2, a.city, a.state,
+    a.country, a.pincode, a.is_primary_address, a.is_shipping_address
+"""
+
+# Address fields a customer may change through update_address
+_ADDRESS_UPDATABLE_FIELDS = frozenset(
+    {
+        "address_title",
+        "address_type",
+        "address_line1",
+        "address_line2",
+        "city",
+        "state",
+        "country",
+        "pincode",
+        "phone",
+        "is_primary_address",
+        "is_shipping_address",
+    }
+)
+
+# Flags that need the Address controller to run when switched on
+_PREFERRED_ADDRESS_FIELDS = frozenset({"is_primary_address", "is_shipping_address"})
+
+
+def get_owned_addresses(customer, address_names):
+    """Return the subset of address_names linked to the customer and not deleted, in one query"""
+    address_names = [name for name in address_names if name]
+    if not address_names:
+        return set()
+
+    return set(
+        frappe.db.sql_list(
+            """
+            SELECT dl.parent
+            FROM `tabDynamic Link` dl
+            INNER JOIN `tabAddress` a ON a.name = dl.parent
+            WHERE dl.link_doctype = 'Customer'
+                AND dl.link_name = %(customer)s
+                AND dl.parenttype = 'Address'
+                AND dl.parent IN %(address_names)s
+                AND COALESCE(a.disabled, 0) = 0
+            """,
+            {"customer": customer, "address_names": tuple(address_names)},
+        )
+    )
+
+
+def _authorize_address(customer, address_name):
+    """Check that the address is linked to the customer and not deleted"""
+    return address_name in get_owned_addresses(customer, [address_name])
+
+
+def _parse_address_data(address_data):
+    """Decode address_data once, whether it arrived as a dict or a JSON string"""
+    address_data = frappe.parse_json(address_data) if address_data else None
+    if not address_data:
+        frappe.throw(_("address_data is required"), frappe.ValidationError)
+    if not isinstance(address_data, dict):
+        frappe.throw(_("address_data must be an object"), frappe.ValidationError)
+    return address_data
+
+
+def _list_addresses_for_customer(customer, start, page_length, cursor=None):
+    """Return a page of the customer's enabled addresses and the cursor of the next page, if any.
+
+    A cursor from the previous page takes precedence over start.
+    """
+    # Fetch one extra row to know whether another page exists
+    values = {"customer": customer, "limit": page_length + 1, "offset": 0 if cursor else start}
+    after_cursor = f"AND {keyset_condition(cursor, 'a', values)}" if cursor else ""
+
+    # Fetch the customer's addresses through their Dynamic Link rows in one query
+    addresses = frappe.db.sql(
+        f"""
+        SELECT {_ADDRESS_LIST_COLUMNS}, a.modified
+        FROM `tabAddress` a
+        INNER JOIN `tabDynamic Link` dl
+            ON dl.parent = a.name AND dl.parenttype = 'Address'
+        WHERE dl.link_doctype = 'Customer'
+            AND dl.link_name = %(customer)s
+            AND COALESCE(a.disabled, 0) = 0
+            {after_cursor}
+        ORDER BY a.modified DESC, a.name DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+        """,
+        values,
+        as_dict=True,
+    )
+
+    has_more = len(addresses) > page_length
+    addresses = addresses[:page_length]
+    next_cursor = encode_cursor(addresses[-1]) if has_more else None
+
+    for address in addresses:
+        del address["modified"]
+
+    return addresses, next_cursor
 
 
 @frappe.whitelist(allow_guest=True)
 @require_jwt_auth
-def list_addresses(customer):
-    """Get addresses for a customer"""
-    if not customer:
-        frappe.throw(_("customer is required"), frappe.ValidationError)
-
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-
-    # Get all addresses linked to this customer
-    address_links = frappe.get_all(
-        "Dynamic Link",
-        filters={
-            "link_doctype": "Customer",
-            "link_name": customer,
-            "parenttype": "Address",
-        },
-        fields=["parent"],
-    )
+@validate_args(customer="required|exists:Customer")
+def list_addresses(customer, start=0, page_length=50, cursor=None):
+    """Get a page of addresses for a customer; pass next_cursor back as cursor for the next page"""
+    start = max(cint(start), 0)
+    page_length = min(max(cint(page_length), 1), MAX_ADDRESS_PAGE_LENGTH)
+
+    addresses, next_cursor = _list_addresses_for_customer(customer, start, page_length, cursor)
 
-    if not address_links:
-        return {"success": True, "data": []}
-
-    address_names = [link.parent for link in address_links]
-
-    addresses = frappe.get_all(
-        "Address",
-        filters={"name": ["in", address_names], "disabled": 0},
-        fields=[
-            "name",
-            "phone",
-            "address_title",
-            "address_type",
-            "address_line1",
-            "address_line2",
-            "city",
-            "state",
-            "country",
-            "pincode",
-            "is_primary_address",
-            "is_shipping_address",
-        ],
-        order_by="modified desc",
+    return {
+        "success": True,
+        "data": addresses,
+        "start": start,
+        "page_length": page_length,
+        "has_more": bool(next_cursor),
+        "next_cursor": next_cursor,
+    }
+
+
+@frappe.whitelist(allow_guest=True)
+@require_jwt_auth
+def list_addresses_bulk(customers):
+    """Get addresses for several of the current user's customers in one call, grouped by customer"""
+    customers = frappe.parse_json(customers) if customers else None
+    if isinstance(customers, str):
+        customers = [customers]
+
+    if not customers:
+        frappe.throw(_("customers is required"), frappe.ValidationError)
+
+    customers = list(dict.fromkeys(customers))
+    if len(customers) > MAX_BULK_ADDRESS_CUSTOMERS:
+        frappe.throw(
+            _("At most {0} customers can be requested at once").format(MAX_BULK_ADDRESS_CUSTOMERS),
+            frappe.ValidationError,
+        )
+
+    # Only customers the user is a Portal User of may be listed
+    linked_customers = set(
+        frappe.get_all(
+            "Portal User",
+            filters={"user": frappe.session.user, "parenttype": "Customer", "parent": ["in", customers]},
+            pluck="parent",
+        )
+    )
+    unauthorized = [customer for customer in customers if customer not in linked_customers]
+    if unauthorized:
+        frappe.throw(
+            _("Not authorized for customers: {0}").format(", ".join(unauthorized)), frappe.PermissionError
+        )
+
+    rows = frappe.db.sql(
+        f"""
+        SELECT dl.link_name AS customer, {_ADDRESS_LIST_COLUMNS}
+        FROM `tabAddress` a
+        INNER JOIN `tabDynamic Link` dl
+            ON dl.parent = a.name AND dl.parenttype = 'Address'
+        WHERE dl.link_doctype = 'Customer'
+            AND dl.link_name IN %(customers)s
+            AND COALESCE(a.disabled, 0) = 0
+        ORDER BY a.modified DESC
+        """,
+        {"customers": tuple(customers)},
+        as_dict=True,
     )
 
-    return {"success": True, "data": addresses}
+    addresses_by_customer = defaultdict(list)
+    for row in rows:
+        addresses_by_customer[row.pop("customer")].append(row)
+
+    return {
+        "success": True,
+        "data": {customer: addresses_by_customer[customer] for customer in customers},
+    }
 
 
 @frappe.whitelist(allow_guest=True)
 @require_jwt_auth
+@validate_args(customer="required|exists:Customer")
 def create_address(customer, address_data):
     """Create a new address for the customer"""
-    if not customer:
-        frappe.throw(_("customer is required"), frappe.ValidationError)
+    try:
+        payload = CreateAddressData(**_parse_address_data(address_data))
+    except ValidationError as e:
+        frappe.throw(format_validation_error(e), frappe.ValidationError)
 
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-
-    if not address_data:
-        frappe.throw(_("address_data is required"), frappe.ValidationError)
+    # Country is the only Link field a client can set; the customer link was checked above
+    if not frappe.db.exists("Country", payload.country):
+        frappe.throw(_("Country {0} not found").format(payload.country), frappe.ValidationError)
 
-    # Create address
-    address = frappe.get_doc({"doctype": "Address", **address_data})
+    # Create address, titled after the customer unless the client chose a title
+    address = frappe.get_doc(
+        {
+            "doctype": "Address",
+            "address_title": customer,
+            **payload.model_dump(exclude_none=True),
+        }
+    )
 
     # Link address to customer using Dynamic Link
     address.append("links", {"link_doctype": "Customer", "link_name": customer})
 
+    # All links are verified above, so skip the per-field link validation queries
+    address.flags.ignore_links = True
     address.insert(ignore_permissions=True)
-    
+
     return {
         "success": True,
         "message": _("Address created successfully"),
@@ -85,61 +235,43 @@ def create_address(customer, address_data):
     }
 
 
+def _validate_address_updates(updates):
+    """Check the Link and Select values of an address update"""
+    if "country" in updates and not frappe.db.exists("Country", updates["country"]):
+        frappe.throw(_("Country {0} not found").format(updates["country"]), frappe.ValidationError)
+
+    if "address_type" in updates:
+        address_types = (frappe.get_meta("Address").get_field("address_type").options or "").split("\n")
+        if updates["address_type"] not in address_types:
+            frappe.throw(
+                _("Invalid address_type {0}").format(updates["address_type"]), frappe.ValidationError
+            )
+
+
 @frappe.whitelist(allow_guest=True)
 @require_jwt_auth
+@validate_args(customer="required", address_name="required")
 def update_address(customer, address_name, address_data):
     """Update an existing address for the customer"""
-    if not customer:
-        frappe.throw(_("customer is required"), frappe.ValidationError)
-
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-
-    if not address_name:
-        frappe.throw(_("address_name is required"), frappe.ValidationError)
-
-    if not address_data:
-        frappe.throw(_("address_data is required"), frappe.ValidationError)
+    address_data = _parse_address_data(address_data)
 
     # Verify address exists and belongs to the customer
-    address_link = frappe.db.get_value(
-        "Dynamic Link",
-        {
-            "link_doctype": "Customer",
-            "link_name": customer,
-            "parenttype": "Address",
-            "parent": address_name,
-        },
-        "parent",
-    )
-
-    if not address_link:
+    if not _authorize_address(customer, address_name):
         frappe.throw(_("Address not found or unauthorized"), frappe.PermissionError)
 
-    # Get and update the address
-    address_doc = frappe.get_doc("Address", address_name)
-
     # Update allowed fields
-    allowed_fields = [
-        "address_title",
-        "address_type",
-        "address_line1",
-        "address_line2",
-        "city",
-        "state",
-        "country",
-        "pincode",
-        "phone",
-        "is_primary_address",
-        "is_shipping_address",
-        "disabled",
-    ]
+    updates = {field: value for field, value in address_data.items() if field in _ADDRESS_UPDATABLE_FIELDS}
 
-    for field in allowed_fields:
-        if field in address_data:
-            setattr(address_doc, field, address_data[field])
+    # set_value skips the Address controller, so check the constrained fields here
+    _validate_address_updates(updates)
 
-    address_doc.save(ignore_permissions=True)
+    if any(cint(updates.get(field)) for field in _PREFERRED_ADDRESS_FIELDS):
+        # Flagging an address as preferred needs the Address controller to unset the previous one
+        address_doc = frappe.get_doc("Address", address_name)
+        address_doc.update(updates)
+        address_doc.save(ignore_permissions=True)
+    elif updates:
+        frappe.db.set_value("Address", address_name, updates)
 
     return {
         "success": True,
@@ -150,34 +282,16 @@ def update_address(customer, address_name, address_data):
 
 @frappe.whitelist(allow_guest=True)
 @require_jwt_auth
+@validate_args(customer="required", address_name="required")
 def delete_address(customer, address_name):
     """Delete an address for the customer"""
-    if not customer:
-        frappe.throw(_("customer is required"), frappe.ValidationError)
-
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-
-    if not address_name:
-        frappe.throw(_("address_name is required"), frappe.ValidationError)
-
     # Verify address exists and belongs to the customer
-    address_link = frappe.db.get_value(
-        "Dynamic Link",
-        {
-            "link_doctype": "Customer",
-            "link_name": customer,
-            "parenttype": "Address",
-            "parent": address_name,
-        },
-        "parent",
-    )
-
-    if not address_link:
+    if not _authorize_address(customer, address_name):
         frappe.throw(_("Address not found or unauthorized"), frappe.PermissionError)
 
-    # Delete the address
-    frappe.delete_doc("Address", address_name, ignore_permissions=True)
+    # Soft delete: disabled addresses drop out of the listings, while documents
+    # already referencing the address stay valid and no link scan is needed
+    frappe.db.set_value("Address", address_name, "disabled", 1)
 
     return {
         "success": True,
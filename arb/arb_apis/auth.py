@@ -2,7 +2,8 @@
 JWT Authentication API for ARB
 """
 
-from datetime import datetime, timezone
+import hmac
+from datetime import datetime, timedelta, timezone
 
 import frappe
 from frappe import _
@@ -30,8 +31,9 @@ from arb.arb_apis.utils.authentication import (
     generate_refresh_token,
     hash_otp,
     require_jwt_auth,
-    verify_jwt_token,
+    verify_jwt_token_cached,
 )
+from arb.arb_apis.utils.error_log import log_error_async
 from arb.arb_apis.utils.frappe_configs import (
     get_otp_expiry_minutes,
     get_otp_resend_limit_per_hour,
@@ -40,8 +42,62 @@ from arb.arb_apis.utils.notification_templates import (
     send_password_reset_success_email,
     send_welcome_notification,
 )
+from arb.arb_apis.utils.otp_store import (
+    delete_otp,
+    get_otp,
+    increment_otp_attempts,
+    store_otp,
+    update_otp,
+    verify_otp,
+)
 from arb.arb_apis.utils.pydantic_validator import validate_request
 
+USER_PROFILE_CACHE_SECONDS = 60
+USER_PROFILE_FIELDS = [
+    "email",
+    "mobile_no",
+    "first_name",
+    "last_name",
+    "full_name",
+    "user_image",
+]
+# Columns login reads for the user, fetched in one query
+LOGIN_USER_FIELDS = ("name", "enabled", *USER_PROFILE_FIELDS)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp_to_iso(timestamp):
+    # Plain arithmetic on a fixed epoch, no local timezone lookup
+    return (_EPOCH + timedelta(seconds=timestamp)).isoformat()
+
+
+def _user_profile_cache_key(user_email):
+    return f"arb_user_profile_{user_email}"
+
+
+def get_user_profile(user_email):
+    """
+    Get the User fields returned by the profile APIs, cached briefly in Redis
+    """
+    cache_key = _user_profile_cache_key(user_email)
+    profile = frappe.cache().get_value(cache_key)
+
+    if profile is None:
+        profile = frappe.db.get_value(
+            "User", user_email, USER_PROFILE_FIELDS, as_dict=True
+        )
+        if profile:
+            frappe.cache().set_value(
+                cache_key, profile, expires_in_sec=USER_PROFILE_CACHE_SECONDS
+            )
+
+    return profile
+
+
+def clear_user_profile_cache(user_email):
+    frappe.cache().delete_key(_user_profile_cache_key(user_email))
+
 
 def get_msg91_settings():
     """
@@ -141,31 +197,24 @@ def send_otp(purpose, identifier, extra_data=None):
     otp_hash = hash_otp(otp)
     expiry_minutes = get_otp_expiry_minutes()
 
-    cache_key = f"otp_{purpose}_{identifier}"
-
-    existing = frappe.cache().get_value(cache_key) or {}
-    resend_attempts = existing.get("resend_attempts", 0)
-
-    if existing:
-        resend_attempts += 1
-        if resend_attempts > get_otp_resend_limit_per_hour():
-            frappe.throw(
-                _("OTP resend limit exceeded. Please try again after some time.")
-            )
-
-    frappe.cache().set_value(
-        cache_key,
+    # The resend check and the write happen atomically in Redis
+    stored = store_otp(
+        purpose,
+        identifier,
         {
             "otp_hash": otp_hash,
             "attempts": 0,
-            "resend_attempts": resend_attempts,
             "verified": False,
             "created_at": datetime.now(timezone.utc).isoformat(),
             "extra": extra_data or {},
         },
         expires_in_sec=expiry_minutes * 60,
+        resend_limit=get_otp_resend_limit_per_hour(),
     )
 
+    if not stored:
+        frappe.throw(_("OTP resend limit exceeded. Please try again after some time."))
+
     if identifier and len(identifier) == 10 and identifier.isdigit():
         try:
             send_sms_via_msg91(
@@ -192,24 +241,20 @@ def send_otp(purpose, identifier, extra_data=None):
 def login(data: LoginRequest):
     try:
 
-        user_email = None
-
-        if "@" in data.username:
-            user_list = frappe.db.get_all(
-                "User", filters={"email": data.username}, fields=["name"], limit=1
-            )
-        else:
-            user_list = frappe.db.get_all(
-                "User", filters={"mobile_no": data.username}, fields=["name"], limit=1
-            )
+        lookup_field = "email" if "@" in data.username else "mobile_no"
 
-        if user_list:
-            user_email = user_list[0].name
+        # Everything the response needs, in one query
+        user = frappe.db.get_value(
+            "User",
+            {lookup_field: data.username},
+            LOGIN_USER_FIELDS,
+            as_dict=True,
+        )
 
-        if not user_email:
+        if not user:
             frappe.throw(_("Invalid credentials, user not found"))
 
-        user = frappe.get_doc("User", user_email)
+        user_email = user.name
 
         if user.enabled != 1:
             frappe.throw(_("User account is disabled"))
@@ -284,7 +329,7 @@ def login(data: LoginRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Login Error")
+        log_error_async("ARB Login Error")
         return {
             "status": "error",
             "message": "Authentication failed",
@@ -296,7 +341,7 @@ def login(data: LoginRequest):
 def refresh_token(data: RefreshTokenRequest):
     try:
         # Verify refresh token
-        payload = verify_jwt_token(data.refresh_token)
+        payload = verify_jwt_token_cached(data.refresh_token)
 
         if not payload or payload.get("type") != "refresh":
             frappe.throw(_("Invalid refresh token"))
@@ -304,11 +349,11 @@ def refresh_token(data: RefreshTokenRequest):
         email = payload.get("email")
 
         # Validate user still exists and is enabled
-        if not frappe.db.exists("User", email):
+        enabled = frappe.db.get_value("User", email, "enabled")
+        if enabled is None:
             frappe.throw(_("User not found"))
 
-        user = frappe.get_doc("User", email)
-        if user.enabled != 1:
+        if enabled != 1:
             frappe.throw(_("User account is disabled"))
 
         # Generate new access token
@@ -337,7 +382,7 @@ def refresh_token(data: RefreshTokenRequest):
 @validate_request(ValidateTokenRequest)
 def validate_token(data: ValidateTokenRequest):
     try:
-        payload = verify_jwt_token(data.token)
+        payload = verify_jwt_token_cached(data.token)
 
         if not payload:
             return {
@@ -348,15 +393,15 @@ def validate_token(data: ValidateTokenRequest):
 
         # Validate user still exists
         email = payload.get("email")
-        if not frappe.db.exists("User", email):
+        enabled = frappe.db.get_value("User", email, "enabled")
+        if enabled is None:
             return {
                 "status": "invalid",
                 "valid": False,
                 "message": "User not found",
             }
 
-        user = frappe.get_doc("User", email)
-        if user.disabled:
+        if enabled != 1:
             return {
                 "status": "invalid",
                 "valid": False,
@@ -367,8 +412,8 @@ def validate_token(data: ValidateTokenRequest):
             "status": "valid",
             "valid": True,
             "email": email,
-            "issued_at": datetime.fromtimestamp(payload.get("iat")).isoformat(),
-            "expires_at": datetime.fromtimestamp(payload.get("exp")).isoformat(),
+            "issued_at": _timestamp_to_iso(payload.get("iat")),
+            "expires_at": _timestamp_to_iso(payload.get("exp")),
         }
 
     except Exception:
@@ -394,7 +439,13 @@ def get_current_user():
             "message": "No user is logged in",
         }
 
-    user = frappe.get_doc("User", user_email)
+    user = get_user_profile(user_email)
+    if not user:
+        return {
+            "status": "error",
+            "message": "User not found",
+        }
+
     portal_users = frappe.db.get_all(
         "Portal User",
         filters={"user": user_email, "parenttype": "Customer"},
@@ -415,35 +466,23 @@ def get_current_user():
         )
 
         if customer:
-            # Get addresses for this customer
-            address_links = frappe.db.get_all(
-                "Dynamic Link",
-                filters={"link_doctype": "Customer", "link_name": customer_name},
-                fields=["parent"],
+            # Get addresses for this customer; the statement text is the same for every customer
+            addresses = frappe.db.sql(
+                """
+                SELECT
+                    a.name, a.address_title, a.address_line1, a.address_line2,
+                    a.city, a.state, a.pincode, a.country,
+                    a.is_primary_address, a.is_shipping_address
+                FROM `tabAddress` a
+                INNER JOIN `tabDynamic Link` dl
+                    ON dl.parent = a.name AND dl.parenttype = 'Address'
+                WHERE dl.link_doctype = 'Customer' AND dl.link_name = %s
+                    AND COALESCE(a.disabled, 0) = 0
+                """,
+                customer_name,
+                as_dict=True,
             )
 
-            addresses = []
-            for addr_link in address_links:
-                address = frappe.db.get_value(
-                    "Address",
-                    addr_link.parent,
-                    [
-                        "name",
-                        "address_title",
-                        "address_line1",
-                        "address_line2",
-                        "city",
-                        "state",
-                        "pincode",
-                        "country",
-                        "is_primary_address",
-                        "is_shipping_address",
-                    ],
-                    as_dict=True,
-                )
-                if address:
-                    addresses.append(address)
-
             companies_list.append(
                 {
                     "customer_id": customer.name,
@@ -501,28 +540,22 @@ def verify_signup_otp(data: VerifyOTPRequest):
         if not identifier:
             frappe.throw(_("Phone number is required"), title="Validation Error")
 
-        cache_key = f"otp_signup_{identifier}"
-        otp_data = frappe.cache().get_value(cache_key)
+        # Attempt counting and the verified flag are updated atomically in Redis
+        status, otp_data = verify_otp(
+            "signup",
+            identifier,
+            hash_otp(data.otp),
+        )
 
-        if not otp_data:
+        if status == "missing":
             frappe.throw(_("OTP expired or invalid"))
 
-        # Rest of your existing code remains the same...
-        if otp_data["attempts"] >= 3:
+        if status == "locked":
             frappe.throw(_("Too many attempts. Request a new OTP"))
 
-        if hash_otp(data.otp) != otp_data["otp_hash"]:
-            otp_data["attempts"] += 1
-            frappe.cache().set_value(
-                cache_key, otp_data, expires_in_sec=get_otp_expiry_minutes() * 60
-            )
+        if status == "invalid":
             frappe.throw(_("Invalid OTP"))
 
-        otp_data["verified"] = True
-        frappe.cache().set_value(
-            cache_key, otp_data, expires_in_sec=get_otp_expiry_minutes() * 60
-        )
-
         return {
             "status": "success",
             "message": "OTP verified successfully",
@@ -537,7 +570,7 @@ def verify_signup_otp(data: VerifyOTPRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Verify OTP Error")
+        log_error_async("ARB Verify OTP Error")
         return {
             "status": "error",
             "message": "Failed to verify OTP. Please try again.",
@@ -553,8 +586,7 @@ def complete_signup(data: CompleteSignupRequest):
     """
     try:
         # Verify OTP was completed
-        otp_key = f"otp_signup_{data.phone}"
-        otp_data = frappe.cache().get_value(otp_key)
+        otp_data = get_otp("signup", data.phone)
 
         if not otp_data or not otp_data.get("verified"):
             frappe.throw(_("Phone verification required"))
@@ -568,13 +600,21 @@ def complete_signup(data: CompleteSignupRequest):
             if "@" not in email or "." not in email:
                 frappe.throw(_("Please enter a valid email address"))
 
-            # Check if email exists
-            if frappe.db.exists("User", {"email": email}):
-                frappe.throw(
-                    _(
-                        "Email already registered. Please use a different email or login."
-                    )
-                )
+        # Look for an existing user with this email or phone in one query
+        duplicates = frappe.db.sql(
+            """
+            SELECT email, mobile_no FROM `tabUser`
+            WHERE email = %(email)s OR mobile_no = %(phone)s
+            """,
+            {"email": email or None, "phone": data.phone},
+            as_dict=True,
+        )
+
+        if email and any(row.email == email for row in duplicates):
+            frappe.throw(_("Email already registered. Please use a different email or login."))
+
+        if any(row.mobile_no == data.phone for row in duplicates):
+            frappe.throw(_("Phone number already registered. Please login instead."))
 
         # Generate username (use phone as username)
         username = f"user_{data.phone}"
@@ -588,10 +628,6 @@ def complete_signup(data: CompleteSignupRequest):
         first_name = name_parts[0]
         last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-        # Check if user already exists (edge case)
-        if frappe.db.exists("User", {"mobile_no": data.phone}):
-            frappe.throw(_("Phone number already registered. Please login instead."))
-
         # Create new user
         user = frappe.get_doc(
             {
@@ -618,14 +654,22 @@ def complete_signup(data: CompleteSignupRequest):
         access_token = generate_jwt_token(user.name)
         refresh_token = generate_refresh_token(user.name)
 
-        # Send welcome notification
+        # Send welcome notification from a background worker
         try:
-            send_welcome_notification(user.name, first_name, data.phone, email)
+            frappe.enqueue(
+                send_welcome_notification,
+                queue="short",
+                enqueue_after_commit=True,
+                username=user.name,
+                first_name=first_name,
+                phone=data.phone,
+                email=email,
+            )
         except Exception:
-            frappe.log_error(frappe.get_traceback(), "ARB Welcome Notification Error")
+            log_error_async("ARB Welcome Notification Error")
 
         # Clear OTP cache
-        frappe.cache().delete_key(otp_key)
+        delete_otp("signup", data.phone)
 
         return {
             "status": "success",
@@ -652,7 +696,7 @@ def complete_signup(data: CompleteSignupRequest):
         }
     except Exception:
         frappe.db.rollback()
-        frappe.log_error(frappe.get_traceback(), "ARB Complete Signup Error")
+        log_error_async("ARB Complete Signup Error")
         return {
             "status": "error",
             "message": "Failed to create account. Please try again.",
@@ -715,7 +759,7 @@ def get_company_details(data):
 
     except Exception as e:
         frappe.db.rollback()
-        frappe.log_error(frappe.get_traceback(), "Customer Onboard Creation Error")
+        log_error_async("Customer Onboard Creation Error")
         return {
             "status": "error",
             "message": f"Failed to create customer onboard: {str(e)}",
@@ -742,7 +786,7 @@ def resend_signup_otp(data: ResendOTPRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Resend OTP Error")
+        log_error_async("ARB Resend OTP Error")
         return {
             "status": "error",
             "message": "Failed to resend OTP. Please try again.",
@@ -759,52 +803,29 @@ def forgot_password_request(data: ForgotPasswordRequest):
         phone = data.phone
         email = data.email
 
-        user_email = None
-        user_phone = None
-        user_name = None
-
+        # Find user by phone, or by email when no phone was given
+        filters = {"enabled": 1}
         if phone:
-            # Find user by phone
-            user_list = frappe.db.get_all(
-                "User",
-                filters={"mobile_no": phone, "enabled": 1},
-                fields=["name", "email", "mobile_no", "first_name"],
-                limit=1,
-            )
-
-            if not user_list:
-                frappe.throw(_("No account found with this phone number"))
-
-            user_email = user_list[0].name
-            user_phone = phone
-            user_name = user_list[0].first_name
-
-        elif email:
-            # Find user by email
+            filters["mobile_no"] = phone
+        else:
             if "@" not in email:
                 frappe.throw(_("Please enter a valid email address"))
+            filters["email"] = email
 
-            user_list = frappe.db.get_all(
-                "User",
-                filters={"email": email, "enabled": 1},
-                fields=["name", "email", "mobile_no", "first_name"],
-                limit=1,
-            )
-
-            if not user_list:
-                frappe.throw(_("No account found with this email address"))
+        user = frappe.db.get_value("User", filters, ["name", "mobile_no", "first_name"], as_dict=True)
 
-            user_email = user_list[0].name
-            user_phone = user_list[0].mobile_no
-            user_name = user_list[0].first_name
+        if not user:
+            if phone:
+                frappe.throw(_("No account found with this phone number"))
+            frappe.throw(_("No account found with this email address"))
 
         return send_otp(
             purpose="reset",
-            identifier=user_email,
+            identifier=user.name,
             extra_data={
-                "user_email": user_email,
-                "phone": user_phone,
-                "name": user_name,
+                "user_email": user.name,
+                "phone": user.mobile_no,
+                "name": user.first_name,
             },
         )
 
@@ -826,33 +847,14 @@ def verify_reset_otp(data: VerifyResetOTPRequest):
         otp = data.otp
 
         # Find user by identifier (phone or email)
-        user_list = None
-
-        if len(identifier) == 10 and identifier.isdigit():
-            # Phone number
-            user_list = frappe.db.get_all(
-                "User",
-                filters={"mobile_no": identifier, "enabled": 1},
-                fields=["name", "email", "mobile_no"],
-                limit=1,
-            )
-        else:
-            # Email
-            user_list = frappe.db.get_all(
-                "User",
-                filters={"email": identifier, "enabled": 1},
-                fields=["name", "email", "mobile_no"],
-                limit=1,
-            )
+        lookup_field = "mobile_no" if len(identifier) == 10 and identifier.isdigit() else "email"
+        user_email = frappe.db.get_value("User", {lookup_field: identifier, "enabled": 1}, "name")
 
-        if not user_list:
+        if not user_email:
             frappe.throw(_("Account not found"))
 
-        user_email = user_list[0].name
-
         # Get reset data
-        reset_key = f"otp_reset_{user_email}"
-        reset_data = frappe.cache().get_value(reset_key)
+        reset_data = get_otp("reset", user_email)
 
         if not reset_data:
             frappe.throw(_("Reset request has expired. Please request again."))
@@ -862,19 +864,24 @@ def verify_reset_otp(data: VerifyResetOTPRequest):
             frappe.throw(_("Too many failed attempts. Please request a new OTP."))
 
         # Verify OTP
-        if hash_otp(otp) != reset_data["otp_hash"]:
-            reset_data["attempts"] += 1
-            frappe.cache().set_value(reset_key, reset_data, expires_in_sec=15 * 60)
+        if not hmac.compare_digest(hash_otp(otp), reset_data["otp_hash"]):
+            increment_otp_attempts("reset", user_email)
             frappe.throw(_("Invalid OTP"))
 
-        # Mark as verified
-        reset_data["verified"] = True
-        frappe.cache().set_value(reset_key, reset_data, expires_in_sec=15 * 60)
-
-        # Generate reset token for password change
+        # Mark as verified and attach a reset token for password change, in one write
         reset_token = frappe.generate_hash(length=32)
-        reset_data["reset_token"] = reset_token
-        frappe.cache().set_value(reset_key, reset_data, expires_in_sec=15 * 60)
+        update_otp(
+            "reset",
+            user_email,
+            expires_in_sec=15 * 60,
+            verified=True,
+            reset_token=reset_token,
+        )
+
+        # Reverse index so reset_password can find the user without scanning keys
+        frappe.cache().set_value(
+            f"reset_token_{reset_token}", user_email, expires_in_sec=15 * 60
+        )
 
         return {
             "status": "success",
@@ -890,7 +897,7 @@ def verify_reset_otp(data: VerifyResetOTPRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Verify Reset OTP Error")
+        log_error_async("ARB Verify Reset OTP Error")
         return {
             "status": "error",
             "message": "Failed to verify OTP. Please try again.",
@@ -908,23 +915,17 @@ def reset_password(data: ResetPasswordRequest):
         new_password = data.new_password
 
         # Find user with this reset token
-        user_email = None
-        reset_key = None
+        token_key = f"reset_token_{reset_token}"
+        user_email = frappe.cache().get_value(token_key)
 
-        # Search all reset keys to find matching token
-        # Note: This is simplified. In production, you might want to store token-user mapping
-        # For now, we'll check all password_reset_* keys
-        cache_keys = frappe.cache().get_keys("otp_reset_*")
+        reset_data = get_otp("reset", user_email) if user_email else None
 
-        for key in cache_keys:
-            actual_key = key.decode("utf-8").split("|")[-1]
-            reset_data = frappe.cache().get_value(actual_key)
-
-            if reset_data and reset_data.get("reset_token") == reset_token:
-                if reset_data.get("verified"):
-                    user_email = reset_data.get("extra", {}).get("user_email")
-                    reset_key = key
-                    break
+        if (
+            not reset_data
+            or not reset_data.get("verified")
+            or reset_data.get("reset_token") != reset_token
+        ):
+            user_email = None
 
         if not user_email:
             frappe.throw(_("Invalid or expired reset token"))
@@ -936,13 +937,21 @@ def reset_password(data: ResetPasswordRequest):
         frappe.utils.password.update_password(user_email, new_password)
 
         # Clear reset data
-        frappe.cache().delete_key(reset_key)
+        delete_otp("reset", user_email)
+        frappe.cache().delete_key(token_key)
+        clear_user_profile_cache(user_email)
 
         # Log password reset
         frappe.logger().info(f"Password reset for user: {user_email}")
 
-        # Send notification
-        send_password_reset_success_email(user.email, user.first_name)
+        # Send notification from a background worker
+        frappe.enqueue(
+            send_password_reset_success_email,
+            queue="short",
+            enqueue_after_commit=True,
+            email=user.email,
+            user_name=user.first_name,
+        )
 
         return {
             "status": "success",
@@ -957,7 +966,7 @@ def reset_password(data: ResetPasswordRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Reset Password Error")
+        log_error_async("ARB Reset Password Error")
         return {
             "status": "error",
             "message": "Failed to reset password. Please try again.",
@@ -992,7 +1001,7 @@ def resend_reset_otp(data: ResendIdentifierRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Resend Reset OTP Error")
+        log_error_async("ARB Resend Reset OTP Error")
         return {
             "status": "error",
             "message": "Failed to resend OTP. Please try again.",
@@ -1002,20 +1011,19 @@ def resend_reset_otp(data: ResendIdentifierRequest):
 @frappe.whitelist(allow_guest=True)
 @validate_request(VerifyOTPRequest)
 def verify_login_otp(data: VerifyOTPRequest):
-    key = f"otp_login_{data.identifier}"
-    cached = frappe.cache().get_value(key)
+    status, cached = verify_otp(
+        "login",
+        data.identifier,
+        hash_otp(data.otp),
+    )
 
-    if not cached:
+    if status == "missing":
         frappe.throw(_("OTP expired"))
 
-    if cached.get("attempts", 0) >= 3:
+    if status == "locked":
         frappe.throw(_("Too many attempts. Request a new OTP"))
 
-    if hash_otp(data.otp) != cached["otp_hash"]:
-        cached["attempts"] = cached.get("attempts", 0) + 1
-        frappe.cache().set_value(
-            key, cached, expires_in_sec=get_otp_expiry_minutes() * 60
-        )
+    if status == "invalid":
         frappe.throw(_("Invalid OTP"))
 
     user_email = cached.get("extra", {}).get("user_email")
@@ -1025,7 +1033,7 @@ def verify_login_otp(data: VerifyOTPRequest):
     if not frappe.db.exists("User", {"name": user_email, "enabled": 1}):
         frappe.throw(_("Account not found or disabled"))
 
-    frappe.cache().delete_key(key)
+    delete_otp("login", data.identifier)
 
     access = generate_jwt_token(user_email)
     refresh = generate_refresh_token(user_email)
@@ -1083,7 +1091,7 @@ def send_login_otp(data: ResendOTPRequest):
         }
 
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Send Login OTP Error")
+        log_error_async("ARB Send Login OTP Error")
         return {
             "status": "error",
             "message": "Failed to send OTP. Please try again.",
@@ -1102,12 +1110,13 @@ def logout(data: LogoutRequest):
 
     try:
         # Validate refresh token
-        payload = verify_jwt_token(data.refresh_token)
+        payload = verify_jwt_token_cached(data.refresh_token)
         if not payload or payload.get("type") != "refresh":
             frappe.throw(_("Invalid refresh token"))
 
         # Blacklist refresh token
-        blacklist_refresh_token(data.refresh_token)
+        blacklist_refresh_token(data.refresh_token, payload)
+        clear_user_profile_cache(frappe.session.user)
 
         # Clear frappe session context
         frappe.set_user("Guest")
@@ -1126,7 +1135,7 @@ def logout(data: LogoutRequest):
             "message": str(e),
         }
     except Exception:
-        frappe.log_error(frappe.get_traceback(), "ARB Logout Error")
+        log_error_async("ARB Logout Error")
         return {
             "status": "error",
             "message": "Logout failed",
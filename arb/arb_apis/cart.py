@@ -2,47 +2,259 @@
 Cart APIs using Quick Order doctype
 """
 
+import json
+
 import frappe
 from frappe import _
+from frappe.utils import now
+from frappe.utils.caching import http_cache, redis_cache
 
+from arb.arb_apis.address import get_owned_addresses
 from arb.arb_apis.utils.authentication import require_jwt_auth
 
+CART_DEFAULTS_CACHE_SECONDS = 5 * 60
+SHIPPING_PROCESSES_CACHE_SECONDS = 5 * 60
+WEBSITE_ITEM_CACHE_SECONDS = 10 * 60
+_DEFAULT_WAREHOUSE_CACHE_KEY = "arb_default_warehouse"
+
+# Redis hash of Website Item details by item_code, cleared by Website Item doc_events.
+# Writes that skip the hooks are caught by expiring the whole hash.
+_WEBSITE_ITEM_CACHE_KEY = "arb_website_item"
+_WEBSITE_ITEM_FIELDS = ["item_code", "web_item_name", "stock_uom", "published"]
+
+_CART_HEADER_FIELDS = ["name", "shipping_process", "shipping_address", "billing_address"]
+
+
+def _get_cached_default(cache_key, doctype):
+    """Return the first record of a configuration doctype, cached in Redis"""
+    name = frappe.cache().get_value(cache_key)
+    if not name:
+        name = frappe.db.get_value(doctype, {}, "name")
+        if name:
+            frappe.cache().set_value(cache_key, name, expires_in_sec=CART_DEFAULTS_CACHE_SECONDS)
+    return name
+
+
+def _get_default_warehouse():
+    return _get_cached_default(_DEFAULT_WAREHOUSE_CACHE_KEY, "Available Warehouse")
+
+
+def _get_default_shipping_process():
+    return next(iter(_valid_shipping_processes()), None)
+
+
+def clear_default_warehouse_cache(doc=None, method=None):
+    frappe.cache().delete_value(_DEFAULT_WAREHOUSE_CACHE_KEY)
+
+
+def clear_shipping_process_cache(doc=None, method=None, *args):
+    # *args takes the old/new names and merge flag passed to after_rename handlers
+    _get_shipping_processes.clear_cache()
+    _valid_shipping_processes.clear_cache()
+
+
+def _get_website_items(item_codes):
+    """Website Item details keyed by item_code; codes without a Website Item are left out"""
+    cache = frappe.cache()
+    key = cache.make_key(_WEBSITE_ITEM_CACHE_KEY)
+
+    website_items = {
+        item_code: frappe._dict(json.loads(value))
+        for item_code, value in zip(item_codes, cache.hmget(key, item_codes), strict=True)
+        if value
+    }
+
+    missing = [item_code for item_code in item_codes if item_code not in website_items]
+    if missing:
+        fetched = {}
+        for website_item in frappe.db.get_all(
+            "Website Item",
+            filters={"item_code": ["in", missing]},
+            fields=_WEBSITE_ITEM_FIELDS,
+        ):
+            fetched.setdefault(website_item.item_code, website_item)
+
+        if fetched:
+            # frappe's hset pickles a single field; a pipeline stores them all as JSON
+            pipe = cache.pipeline()
+            pipe.hset(key, mapping={code: json.dumps(row) for code, row in fetched.items()})
+            pipe.ttl(key)
+            _added, ttl = pipe.execute()
+            # Only a hash that was just created has no expiry yet; later fills keep its
+            # deadline, so no entry outlives WEBSITE_ITEM_CACHE_SECONDS
+            if ttl < 0:
+                cache.expire(key, WEBSITE_ITEM_CACHE_SECONDS)
+            website_items.update(fetched)
+
+    return website_items
+
+
+def clear_website_item_cache(doc, method=None):
+    frappe.cache().hdel(_WEBSITE_ITEM_CACHE_KEY, doc.item_code)
+
+
+@redis_cache(ttl=SHIPPING_PROCESSES_CACHE_SECONDS)
+def _valid_shipping_processes():
+    # ordered so the first entry is a stable default; the table only holds a handful of rows
+    return tuple(frappe.get_all("Store Link Shipping Process", pluck="name", order_by="creation asc"))
+
+
+def _validate_shipping_process(shipping_process):
+    """Check a client-supplied shipping process exists"""
+    if shipping_process not in _valid_shipping_processes():
+        frappe.throw(_("Invalid Shipping Process"), frappe.ValidationError)
+
+
+def _validate_cart_addresses(customer, shipping_address=None, billing_address=None):
+    """Check client-supplied cart addresses are the customer's own, in one query"""
+    owned_addresses = get_owned_addresses(customer, [shipping_address, billing_address])
+
+    if shipping_address and shipping_address not in owned_addresses:
+        frappe.throw(_("Shipping address not found or unauthorized"), frappe.PermissionError)
+    if billing_address and billing_address not in owned_addresses:
+        frappe.throw(_("Billing address not found or unauthorized"), frappe.PermissionError)
+
 
 def _get_existing_cart(customer):
-    """Fetch existing draft cart for customer or None."""
-    existing_cart = frappe.db.get_value(
+    """Fetch the header fields of the customer's draft cart or None."""
+    return frappe.db.get_value(
         "Quick Order",
         {"customer": customer, "docstatus": 0},
-        "name",
+        _CART_HEADER_FIELDS,
+        as_dict=True,
         order_by="modified desc",
     )
-    return frappe.get_doc("Quick Order", existing_cart) if existing_cart else None
 
 
-def _get_or_create_cart(
+def _get_cart_for_customer(customer):
+    """Fetch the customer's draft cart header or None, throwing if the customer doesn't exist.
+
+    A cart implies its customer exists, so Customer is only queried when there is no cart.
+    """
+    cart = _get_existing_cart(customer)
+    if not cart and not frappe.db.exists("Customer", customer):
+        frappe.throw(_("Customer not found"), frappe.ValidationError)
+    return cart
+
+
+def _changed_fields(cart, updates):
+    """Drop the updates that match what the cart already holds"""
+    return {field: value for field, value in updates.items() if cart.get(field) != value}
+
+
+def _get_cart_item_doctype():
+    """Child DocType of the cart's items table"""
+    return frappe.get_meta("Quick Order").get_field("table_effn").options
+
+
+def _apply_cart_item_updates(cart_name, item_updates, item_details):
+    """Apply qty changes to a draft cart's items with targeted child-row writes.
+
+    Unlike `save()`, which rewrites every row, only the rows that change are touched.
+    `item_updates` holds one entry per item_code; qty 0 removes the item.
+    """
+    item_doctype = _get_cart_item_doctype()
+    rows = frappe.get_all(
+        item_doctype,
+        filters={"parent": cart_name, "parenttype": "Quick Order", "parentfield": "table_effn"},
+        fields=["name", "item_code", "qty", "idx"],
+        order_by="idx",
+    )
+
+    existing_items = {}
+    for row in rows:
+        existing_items.setdefault(row.item_code, row)
+    next_idx = max((row.idx for row in rows), default=0) + 1
+
+    for entry in item_updates:
+        item_code = entry["item_code"]
+        qty = entry["qty"]
+        existing_item = existing_items.get(item_code)
+
+        if qty == 0:
+            if existing_item:
+                frappe.db.delete(item_doctype, {"name": existing_item.name})
+        elif existing_item:
+            if float(existing_item.qty or 0) != qty:
+                frappe.db.set_value(item_doctype, existing_item.name, "qty", qty)
+        else:
+            details = item_details[item_code]
+            frappe.get_doc(
+                {
+                    "doctype": item_doctype,
+                    "parent": cart_name,
+                    "parenttype": "Quick Order",
+                    "parentfield": "table_effn",
+                    "idx": next_idx,
+                    "item_code": details.item_code,
+                    "item_name": details.web_item_name,
+                    "qty": qty,
+                    "uom": details.stock_uom,
+                }
+            ).db_insert()
+            next_idx += 1
+
+
+def _prepare_item_updates(items):
+    """Validate an items payload and fetch what's needed to apply it.
+
+    Returns one `{"item_code", "qty"}` entry per item code (the last qty sent wins) and
+    the published Website Item details of every item being added.
+    """
+    # Normalize to list
+    if not isinstance(items, list):
+        items = [items]
+
+    if not items:
+        frappe.throw(_("At least one item is required"), frappe.ValidationError)
+
+    normalized_items = []
+    for item_update in items:
+        item_code = (item_update or {}).get("item_code")
+        qty = float((item_update or {}).get("qty", 0))
+
+        if not item_code:
+            frappe.throw(_("item_code is required"), frappe.ValidationError)
+
+        if qty < 0:
+            frappe.throw(_("qty cannot be negative"), frappe.ValidationError)
+
+        normalized_items.append({"item_code": item_code, "qty": qty})
+
+    # Collapse repeated item codes: the last qty sent for a code wins
+    normalized_items = list({entry["item_code"]: entry for entry in normalized_items}.values())
+
+    # Website item details for every item being added (qty > 0), from the Redis cache
+    codes_to_add = [entry["item_code"] for entry in normalized_items if entry["qty"] > 0]
+    item_details = {}
+    if codes_to_add:
+        item_details = {
+            item_code: website_item
+            for item_code, website_item in _get_website_items(codes_to_add).items()
+            if website_item.published
+        }
+
+    for item_code in codes_to_add:
+        if item_code not in item_details:
+            frappe.throw(_("Item {0} not available").format(item_code), frappe.ValidationError)
+
+    return normalized_items, item_details
+
+
+def _create_cart(
     customer,
+    *,
     shipping_process=None,
     shipping_address=None,
     billing_address=None,
     items=None,
 ):
-    """Get or create a cart (Quick Order) for the customer.
+    """Create a new cart (Quick Order) for a customer who has no draft cart.
 
-    When creating a new cart, `shipping_process` is required by the DocType and must be provided.
+    `shipping_process` is required by the DocType and must be provided.
     Optionally sets `shipping_address` and `billing_address` if provided.
     """
-    # Check if there's an existing draft Quick Order for this customer
-    existing_cart = frappe.db.get_value(
-        "Quick Order",
-        {"customer": customer, "docstatus": 0},
-        "name",
-        order_by="modified desc",
-    )
-
-    if existing_cart:
-        return frappe.get_doc("Quick Order", existing_cart)
-
-    # Create a new Quick Order (cart) — shipping_process and at least one item are required
+    # shipping_process and at least one item are required
     if not shipping_process:
         frappe.throw(
             _("Shipping Process is required to create a cart"), frappe.ValidationError
@@ -54,7 +266,7 @@ def _get_or_create_cart(
             frappe.ValidationError,
         )
 
-    available_warehouse = frappe.db.get_value("Available Warehouse", {}, "name")
+    available_warehouse = _get_default_warehouse()
     if not available_warehouse:
         frappe.throw(
             _("No Available Warehouse found to create cart"), frappe.ValidationError
@@ -64,7 +276,7 @@ def _get_or_create_cart(
         {
             "doctype": "Quick Order",
             "customer": customer,
-            "date": frappe.utils.now(),
+            "date": now(),
             "shipping_process": shipping_process,
             "warehouse": available_warehouse,
             "custom_quick_order_to": "Customer",
@@ -84,15 +296,20 @@ def _get_or_create_cart(
     return cart
 
 
-@frappe.whitelist(allow_guest=True)
-def get_shipping_processes():
-    """Get available shipping processes"""
-    shipping_processes = frappe.get_all(
+@redis_cache(ttl=SHIPPING_PROCESSES_CACHE_SECONDS)
+def _get_shipping_processes():
+    return frappe.get_all(
         "Store Link Shipping Process",
         fields=["name", "shipping_process"],
         order_by="modified desc",
     )
-    return {"success": True, "data": shipping_processes}
+
+
+@frappe.whitelist(allow_guest=True)
+@http_cache(max_age=SHIPPING_PROCESSES_CACHE_SECONDS, stale_while_revalidate=SHIPPING_PROCESSES_CACHE_SECONDS)
+def get_shipping_processes():
+    """Get available shipping processes"""
+    return {"success": True, "data": _get_shipping_processes()}
 
 
 @frappe.whitelist(allow_guest=True)
@@ -117,9 +334,6 @@ def update_cart(customer, items=None, shipping_process=None, shipping_address=No
     if not customer:
         frappe.throw(_("customer is required"), frappe.ValidationError)
 
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-
     # Validate that at least one update type is provided
     if not items and not shipping_process and not shipping_address and not billing_address:
         frappe.throw(
@@ -127,50 +341,17 @@ def update_cart(customer, items=None, shipping_process=None, shipping_address=No
             frappe.ValidationError,
         )
 
-    cart = _get_existing_cart(customer)
+    # Addresses are checked up front, since every branch below writes them to the cart
+    _validate_cart_addresses(customer, shipping_address, billing_address)
 
     # Handle items update
     if items:
-        # Normalize to list
-        if not isinstance(items, list):
-            items = [items]
-
-        if not items:
-            frappe.throw(_("At least one item is required"), frappe.ValidationError)
-
-        # Pre-validate item payloads and fetch item master data once
-        normalized_items = []
-        item_details_cache = {}
-
-        for item_update in items:
-            item_code = (item_update or {}).get("item_code")
-            qty = float((item_update or {}).get("qty", 0))
-
-            if not item_code:
-                frappe.throw(_("item_code is required"), frappe.ValidationError)
-
-            if qty < 0:
-                frappe.throw(_("qty cannot be negative"), frappe.ValidationError)
-
-            # Cache website item details when needed (only for qty > 0)
-            if qty > 0 and item_code not in item_details_cache:
-                website_item = frappe.db.get_value(
-                    "Website Item",
-                    {"item_code": item_code},
-                    ["item_code", "web_item_name", "stock_uom", "published"],
-                    as_dict=True,
-                )
+        normalized_items, item_details_cache = _prepare_item_updates(items)
 
-                if not website_item or not website_item.published:
-                    frappe.throw(
-                        _(f"Item {item_code} not available"), frappe.ValidationError
-                    )
-                item_details_cache[item_code] = website_item
-
-            normalized_items.append({"item_code": item_code, "qty": qty})
+        existing_cart = _get_cart_for_customer(customer)
 
         # If no cart exists, create one with the initial items
-        if not cart:
+        if not existing_cart:
             # Require at least one item with qty > 0 to create a new cart
             creation_rows = []
             for entry in normalized_items:
@@ -193,106 +374,69 @@ def update_cart(customer, items=None, shipping_process=None, shipping_address=No
 
             # Use provided shipping_process or get default
             if not shipping_process:
-                shipping_process = frappe.db.get_value(
-                    "Store Link Shipping Process", {}, "name"
-                )
+                shipping_process = _get_default_shipping_process()
 
             if not shipping_process:
                 frappe.throw(_("No Shipping Process available"), frappe.ValidationError)
 
-            cart = _get_or_create_cart(
+            cart = _create_cart(
                 customer,
                 shipping_process=shipping_process,
                 shipping_address=shipping_address,
                 billing_address=billing_address,
                 items=creation_rows,
             )
+            cart_name = cart.name
         else:
-            # Process updates on existing cart
-            for entry in normalized_items:
-                item_code = entry["item_code"]
-                qty = entry["qty"]
-
-                existing_item = None
-                for item in cart.table_effn:
-                    if item.item_code == item_code:
-                        existing_item = item
-                        break
-
-                if qty == 0:
-                    if existing_item:
-                        cart.remove(existing_item)
-                else:
-                    if existing_item:
-                        existing_item.qty = qty
-                    else:
-                        details = item_details_cache[item_code]
-                        cart.append(
-                            "table_effn",
-                            {
-                                "item_code": details.item_code,
-                                "item_name": details.web_item_name,
-                                "qty": qty,
-                                "uom": details.stock_uom,
-                            },
-                        )
+            cart_name = existing_cart.name
+            updates = {}
+
+            # Update shipping process if provided
+            if shipping_process:
+                _validate_shipping_process(shipping_process)
+                updates["shipping_process"] = shipping_process
 
             # Update addresses if provided
             if shipping_address:
-                cart.shipping_address = shipping_address
-                cart.billing_address = shipping_address
+                updates["shipping_address"] = shipping_address
+                updates["billing_address"] = shipping_address
             elif billing_address:
-                cart.billing_address = billing_address
+                updates["billing_address"] = billing_address
 
-            # Update shipping process if provided
-            if shipping_process:
-                if not frappe.db.exists("Store Link Shipping Process", shipping_process):
-                    frappe.throw(_("Invalid Shipping Process"), frappe.ValidationError)
-                cart.shipping_process = shipping_process
+            # Write only the item rows that change on the existing cart
+            _apply_cart_item_updates(cart_name, normalized_items, item_details_cache)
 
-            cart.save(ignore_permissions=True)
+            # Also bumps the cart's modified timestamp for the item changes
+            frappe.db.set_value("Quick Order", cart_name, _changed_fields(existing_cart, updates))
     else:
-        # Handle updates without items
+        # Handle updates without items: only scalar fields change, so skip loading the cart
+        cart = _get_cart_for_customer(customer)
         if not cart:
             frappe.throw(_("Cart not found for this customer"), frappe.ValidationError)
+        cart_name = cart.name
+
+        updates = {}
 
         # Update shipping process if provided
         if shipping_process:
-            if not frappe.db.exists("Store Link Shipping Process", shipping_process):
-                frappe.throw(_("Invalid Shipping Process"), frappe.ValidationError)
-            cart.shipping_process = shipping_process
-
-        # Validate and update addresses if provided
-        def _validate_address(addr):
-            if not addr:
-                return True
-            return frappe.db.exists(
-                "Dynamic Link",
-                {
-                    "link_doctype": "Customer",
-                    "link_name": customer,
-                    "parenttype": "Address",
-                    "parent": addr,
-                },
-            )
-
-        if shipping_address and not _validate_address(shipping_address):
-            frappe.throw(_("Shipping address not found or unauthorized"), frappe.PermissionError)
-        if billing_address and not _validate_address(billing_address):
-            frappe.throw(_("Billing address not found or unauthorized"), frappe.PermissionError)
+            _validate_shipping_process(shipping_process)
+            updates["shipping_process"] = shipping_process
 
         if shipping_address:
-            cart.shipping_address = shipping_address
-            cart.billing_address = shipping_address
+            updates["shipping_address"] = shipping_address
+            updates["billing_address"] = shipping_address
         elif billing_address:
-            cart.billing_address = billing_address
+            updates["billing_address"] = billing_address
 
-        cart.save(ignore_permissions=True)
+        # Skip the write entirely when every submitted value is already set
+        updates = _changed_fields(cart, updates)
+        if updates:
+            frappe.db.set_value("Quick Order", cart_name, updates)
 
     return {
         "success": True,
         "message": _("Cart updated successfully"),
-        "cart_id": cart.name,
+        "cart_id": cart_name,
     }
 
 
@@ -303,11 +447,40 @@ def get_cart(customer):
     if not customer:
         frappe.throw(_("customer is required"), frappe.ValidationError)
 
-    if not frappe.db.exists("Customer", customer):
-        return {"success": True, "data": {"items": [], "total": 0}}
+    # The newest draft cart with its rows, website items and latest selling prices, in one query.
+    # A cart without rows still yields one row carrying its header fields.
+    rows = frappe.db.sql(
+        f"""
+        SELECT
+            qo.name AS cart_id, qo.shipping_address, qo.billing_address, qo.shipping_process,
+            qoi.name, qoi.item_code, qoi.item_name, qoi.qty, qoi.uom,
+            wi.web_item_name, wi.website_image,
+            COALESCE((
+                SELECT ip.price_list_rate FROM `tabItem Price` ip
+                WHERE ip.item_code = qoi.item_code AND ip.selling = 1
+                ORDER BY ip.modified DESC
+                LIMIT 1
+            ), 0) AS price
+        FROM (
+            SELECT name, shipping_address, billing_address, shipping_process
+            FROM `tabQuick Order`
+            WHERE customer = %(customer)s AND docstatus = 0
+            ORDER BY modified DESC
+            LIMIT 1
+        ) qo
+        LEFT JOIN `tab{_get_cart_item_doctype()}` qoi
+            ON qoi.parent = qo.name
+            AND qoi.parenttype = 'Quick Order'
+            AND qoi.parentfield = 'table_effn'
+        LEFT JOIN `tabWebsite Item` wi ON wi.item_code = qoi.item_code
+        ORDER BY qoi.idx
+        """,
+        {"customer": customer},
+        as_dict=True,
+    )
 
-    cart = _get_existing_cart(customer)
-    if not cart:
+    # An unknown customer has no cart either, so both get the empty cart response
+    if not rows:
         return {
             "success": True,
             "data": {
@@ -319,50 +492,36 @@ def get_cart(customer):
             },
         }
 
+    cart = rows[0]
     items = []
     total = 0
 
-    for item in cart.table_effn:
-        # Fetch website item image
-        website_item = frappe.db.get_value(
-            "Website Item",
-            {"item_code": item.item_code},
-            ["website_image", "web_item_name"],
-            as_dict=True,
-        )
-
-        # Fetch price
-        price = (
-            frappe.db.get_value(
-                "Item Price",
-                {"item_code": item.item_code, "selling": 1},
-                "price_list_rate",
-            )
-            or 0
-        )
+    for row in rows:
+        if not row.name:
+            continue
 
-        item_total = float(price) * float(item.qty or 0)
+        qty = float(row.qty or 0)
+        price = float(row.price)
+        item_total = price * qty
         total += item_total
 
         items.append(
             {
-                "name": item.name,
-                "item_code": item.item_code,
-                "item_name": (
-                    website_item.web_item_name if website_item else item.item_name
-                ),
-                "qty": float(item.qty or 0),
-                "uom": item.uom,
-                "price": float(price),
+                "name": row.name,
+                "item_code": row.item_code,
+                "item_name": row.web_item_name or row.item_name,
+                "qty": qty,
+                "uom": row.uom,
+                "price": price,
                 "total": item_total,
-                "image": website_item.website_image if website_item else None,
+                "image": row.website_image,
             }
         )
 
     return {
         "success": True,
         "data": {
-            "cart_id": cart.name,
+            "cart_id": cart.cart_id,
             "items": items,
             "total": total,
             "shipping_address": cart.shipping_address,
@@ -380,15 +539,22 @@ def clear_cart(customer):
     if not customer:
         frappe.throw(_("customer is required"), frappe.ValidationError)
 
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-
-    cart = _get_existing_cart(customer)
+    cart = _get_cart_for_customer(customer)
     if not cart:
         frappe.throw(_("Cart not found"), frappe.ValidationError)
+    cart_name = cart.name
 
-    cart.table_effn = []
-    cart.save(ignore_permissions=True)
+    # Delete the item rows directly instead of loading and saving the whole cart
+    frappe.db.delete(
+        _get_cart_item_doctype(),
+        {"parent": cart_name, "parenttype": "Quick Order", "parentfield": "table_effn"},
+    )
+    frappe.db.set_value(
+        "Quick Order",
+        cart_name,
+        {"modified": now(), "modified_by": frappe.session.user},
+        update_modified=False,
+    )
 
     return {"success": True, "message": _("Cart cleared")}
 
@@ -405,39 +571,49 @@ def submit_cart(customer, cart_id=None):
     
     if not customer:
         frappe.throw(_("customer is required"), frappe.ValidationError)
-    
-    if not frappe.db.exists("Customer", customer):
-        frappe.throw(_("Customer not found"), frappe.ValidationError)
-    
-    # Get cart to submit
+
+    # Get cart to submit, reading only the fields the checks below need
+    cart_fields = ["name", "customer", "docstatus", "shipping_process"]
     if cart_id:
         # Validate cart exists and belongs to customer
-        cart_customer = frappe.db.get_value("Quick Order", cart_id, "customer")
-        if not cart_customer:
+        cart = frappe.db.get_value("Quick Order", cart_id, cart_fields, as_dict=True)
+        if not cart:
             frappe.throw(_("Cart not found"), frappe.ValidationError)
-        if cart_customer != customer:
+        if cart.customer != customer:
             frappe.throw(_("Unauthorized access to cart"), frappe.PermissionError)
-        cart = frappe.get_doc("Quick Order", cart_id)
     else:
-        cart = _get_existing_cart(customer)
+        cart = frappe.db.get_value(
+            "Quick Order",
+            {"customer": customer, "docstatus": 0},
+            cart_fields,
+            order_by="modified desc",
+            as_dict=True,
+        )
         if not cart:
+            if not frappe.db.exists("Customer", customer):
+                frappe.throw(_("Customer not found"), frappe.ValidationError)
             frappe.throw(_("Cart not found for this customer"), frappe.ValidationError)
-    
+
     # Validate cart is in draft status
     if cart.docstatus != 0:
         frappe.throw(_("Cart is already submitted or cancelled"), frappe.ValidationError)
-    
+
     # Validate cart has items
-    if not cart.table_effn or len(cart.table_effn) == 0:
+    item_count = frappe.db.count(
+        _get_cart_item_doctype(),
+        {"parent": cart.name, "parenttype": "Quick Order", "parentfield": "table_effn"},
+    )
+    if not item_count:
         frappe.throw(_("Cannot submit an empty cart"), frappe.ValidationError)
-    
+
     # Validate required fields
     if not cart.shipping_process:
         frappe.throw(_("Shipping Process is required to submit cart"), frappe.ValidationError)
-    
-    # Submit the cart
+
+    # Submit the cart, loading the full document only now that the checks passed
+    cart = frappe.get_doc("Quick Order", cart.name)
     cart.submit()
-    
+
     return {
         "success": True,
         "message": _("Cart submitted successfully"),
@@ -1,46 +1,51 @@
 from collections import defaultdict
 import frappe
+from frappe.utils.caching import redis_cache
+
+from arb.arb_apis.doctype.homepage_header_image import HOMEPAGE_CACHE_SECONDS
+from arb.arb_apis.utils.item_lookup import get_items_by_code, get_price_map, get_website_items_by_name
 
 
 @frappe.whitelist(allow_guest=True)
 def get_homepage_products():
+    return _get_homepage_products()
+
+
+@redis_cache(ttl=HOMEPAGE_CACHE_SECONDS)
+def _get_homepage_products():
     homepage = frappe.get_single("Homepages")
     category_map = defaultdict(dict)
 
+    # Fetch every Website Item on the homepage (including route) in one query
+    website_items = get_website_items_by_name(
+        [row.website_item for row in homepage.category_wise_product],
+        [
+            "name",
+            "item_code",
+            "web_item_name",
+            "route",
+            "website_image",
+            "stock_uom",
+            "web_long_description",
+        ],
+    )
+
+    # Item image fallbacks and selling prices for all of them, one query each
+    item_codes = [website_item.item_code for website_item in website_items.values()]
+    items = get_items_by_code(item_codes, ["image"])
+    prices = get_price_map(item_codes)
+
     for row in homepage.category_wise_product:
-        # Fetch Website Item (including route)
-        website_item = frappe.db.get_value(
-            "Website Item",
-            row.website_item,
-            [
-                "name",
-                "item_code",
-                "web_item_name",
-                "route",
-                "website_image",
-                "stock_uom",
-                "web_long_description",
-            ],
-            as_dict=True,
-        )
+        website_item = website_items.get(row.website_item)
 
         if not website_item:
             continue
 
-        # Fetch Item image fallback
-        item_image = (
-            frappe.db.get_value("Item", website_item.item_code, "image")
-        )
+        # Item image fallback
+        item_image = items.get(website_item.item_code, {}).get("image")
 
-        # Fetch selling price
-        price = (
-            frappe.db.get_value(
-                "Item Price",
-                {"item_code": website_item.item_code, "selling": 1},
-                "price_list_rate",
-            )
-            or 0
-        )
+        # Selling price
+        price = prices.get(website_item.item_code) or 0
 
         category = row.item_group
 
@@ -1,10 +1,18 @@
 import frappe
+from frappe.utils.caching import redis_cache
 
+HOMEPAGE_CACHE_SECONDS = 5 * 60
 
-@frappe.whitelist(allow_guest=True)
-def get_homepage_header():
+
+@redis_cache(ttl=HOMEPAGE_CACHE_SECONDS)
+def _get_homepage_header():
     homepage = frappe.get_single("Homepages")
 
     header = [{"idx": row.idx, "image": row.image, "alt_text": row.alt_text} for row in homepage.header]
 
     return {"header": header}
+
+
+@frappe.whitelist(allow_guest=True)
+def get_homepage_header():
+    return _get_homepage_header()
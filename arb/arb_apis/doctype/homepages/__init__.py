@@ -1,9 +1,50 @@
+import re
 from collections import defaultdict
 import frappe
+from frappe.utils.caching import redis_cache
+
+from arb.arb_apis.doctype.homepage_category_product import _get_homepage_products
+from arb.arb_apis.doctype.homepage_header_image import HOMEPAGE_CACHE_SECONDS, _get_homepage_header
+from arb.arb_apis.utils.item_lookup import get_items_by_code, get_price_map, get_website_items_by_name
+from arb.arb_apis.utils.pagination import encode_cursor, keyset_condition
+
+_SEARCH_FIELDS = [
+    "name",
+    "item_code",
+    "web_item_name",
+    "website_image",
+    "stock_uom",
+    "web_long_description",
+    "item_group",
+    "short_description",
+]
+
+# InnoDB's default innodb_ft_min_token_size; shorter words aren't in the FULLTEXT index
+_FULLTEXT_MIN_TOKEN_SIZE = 3
+
+# InnoDB's default FULLTEXT stopwords; a required stopword term would match nothing
+_FULLTEXT_STOPWORDS = frozenset(
+    """
+    a about an are as at be by com de en for from how i in is it la of on or
+    that the this to und was what when where who will with www
+    """.split()
+)
+
+
+def clear_homepage_cache(doc=None, method=None):
+    """Drop the cached homepage responses after a change to anything they show"""
+    _get_homepage_data.clear_cache()
+    _get_homepage_products.clear_cache()
+    _get_homepage_header.clear_cache()
 
 
 @frappe.whitelist(allow_guest=True)
 def get_homepage_data():
+    return _get_homepage_data()
+
+
+@redis_cache(ttl=HOMEPAGE_CACHE_SECONDS)
+def _get_homepage_data():
     homepage = frappe.get_single("Homepages")
     header = [
         {"idx": row.idx, "image": row.image, "alt_text": row.alt_text}
@@ -12,41 +53,37 @@ def get_homepage_data():
 
     category_map = defaultdict(list)
 
+    # Every Website Item on the homepage in one query
+    website_items = get_website_items_by_name(
+        [row.website_item for row in homepage.category_wise_product],
+        [
+            "name",
+            "item_code",
+            "web_item_name",
+            "route",
+            "website_image",
+            "stock_uom",
+            "web_long_description",
+        ],
+    )
+
+    # Image fallback, MOQ and selling price of every Item behind them, one query each
+    item_codes = [website_item.item_code for website_item in website_items.values()]
+    items = get_items_by_code(item_codes, ["image", "custom_sales_moq"])
+    prices = get_price_map(item_codes)
+
     for row in homepage.category_wise_product:
-        website_item = frappe.db.get_value(
-            "Website Item",
-            row.website_item,
-            [
-                "name",
-                "item_code",
-                "web_item_name",
-                "route",
-                "website_image",
-                "stock_uom",
-                "web_long_description",
-            ],
-            as_dict=True,
-        )
+        website_item = website_items.get(row.website_item)
 
         if not website_item:
             continue
-        
-        product_image=(
-            frappe.db.get_value("Item", website_item.item_code, "image")
-        )
 
-        price = (
-            frappe.db.get_value(
-                "Item Price",
-                {"item_code": website_item.item_code, "selling": 1},
-                "price_list_rate",
-            )
-            or 0
-        )
+        item = items.get(website_item.item_code) or frappe._dict()
+        product_image = item.image
+
+        price = prices.get(website_item.item_code) or 0
         product_group = row.item_group
 
-        # Get MOQ from Item
-        item = frappe.get_cached_doc("Item", website_item.item_code)
         moq = item.custom_sales_moq
 
         category_map[row.item_group].append(
@@ -72,54 +109,84 @@ def get_homepage_data():
     return {"message": {"header": header, "categories": categories}}
 
 
+def _fulltext_query(query):
+    """
+    Boolean-mode search requiring every word of the query as a prefix, or None when
+    no word is left after dropping stopwords or a word is shorter than the index can match
+    """
+    words = [word for word in re.findall(r"\w+", query) if word.lower() not in _FULLTEXT_STOPWORDS]
+    if not words or any(len(word) < _FULLTEXT_MIN_TOKEN_SIZE for word in words):
+        return None
+    return " ".join(f"+{word}*" for word in words)
+
+
+def _escape_like(value):
+    """Escape LIKE wildcards so user input only matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_page_sql(filters, condition):
+    """One page of Website Items matching condition and filters, newest first"""
+    return f"""
+        SELECT {", ".join(f"wi.{field}" for field in _SEARCH_FIELDS)}, wi.modified
+        FROM `tabWebsite Item` wi
+        WHERE {" AND ".join([condition, *filters])}
+        ORDER BY wi.modified DESC, wi.name DESC
+        LIMIT %(limit)s
+    """
+
+
 @frappe.whitelist(allow_guest=True)
-def search_website_items(query="", item_group=""):
-    """Search for items in Website Item doctype"""
+def search_website_items(query="", item_group="", cursor=None):
+    """Search for items in Website Item doctype; pass next_cursor back as cursor for the next page"""
     if not query:
         return {"success": False, "data": []}
 
     page_size = 20
+    # Fetch one extra row to know whether another page exists
+    values = {"item_group": item_group, "limit": page_size + 1}
 
-    filters = {
-        "or_filters": [
-            ["web_item_name", "like", f"%{query}%"],
-            ["item_code", "like", f"%{query}%"],
-        ]
-    }
-
+    filters = []
     if item_group:
-        filters["item_group"] = item_group
-
-    website_items = frappe.get_all(
-        "Website Item",
-        or_filters=filters.get("or_filters"),
-        filters={"item_group": item_group} if item_group else None,
-        fields=[
-            "name",
-            "item_code",
-            "web_item_name",
-            "website_image",
-            "stock_uom",
-            "web_long_description",
-            "item_group",
-            "short_description",
-        ],
-        page_length=page_size,
-        order_by="modified desc",
-    )
+        filters.append("wi.item_group = %(item_group)s")
+    if cursor:
+        filters.append(keyset_condition(cursor, "wi", values))
+
+    fulltext_query = _fulltext_query(query)
+    if fulltext_query:
+        # Names and whole item codes are served by the website_item_search_ft FULLTEXT index,
+        # code prefixes by the item_code index; a UNION keeps each branch on its own index
+        values["query"] = fulltext_query
+        values["code_prefix"] = f"{_escape_like(query)}%"
+        fulltext_condition = "MATCH(wi.web_item_name, wi.item_code) AGAINST (%(query)s IN BOOLEAN MODE)"
+        sql = f"""
+            SELECT * FROM (
+                ({_search_page_sql(filters, fulltext_condition)})
+                UNION
+                ({_search_page_sql(filters, "wi.item_code LIKE %(code_prefix)s")})
+            ) wi
+            ORDER BY wi.modified DESC, wi.name DESC
+            LIMIT %(limit)s
+        """
+    else:
+        # Too short or only stopwords for the FULLTEXT index: fall back to a substring scan
+        values["query"] = f"%{query}%"
+        sql = _search_page_sql(filters, "(wi.web_item_name LIKE %(query)s OR wi.item_code LIKE %(query)s)")
+
+    website_items = frappe.db.sql(sql, values, as_dict=True)
+
+    next_cursor = encode_cursor(website_items[page_size - 1]) if len(website_items) > page_size else None
+    website_items = website_items[:page_size]
+
+    item_codes = [item.item_code for item in website_items]
+    item_images = get_items_by_code(item_codes, ["image"])
+    prices = get_price_map(item_codes)
 
     products = []
     for item in website_items:
-        product_image = frappe.db.get_value("Item", item.item_code, "image")
-
-        price = (
-            frappe.db.get_value(
-                "Item Price",
-                {"item_code": item.item_code, "selling": 1},
-                "price_list_rate",
-            )
-            or 0
-        )
+        product_image = item_images.get(item.item_code, {}).get("image")
+
+        price = prices.get(item.item_code) or 0
 
         products.append(
             {
@@ -137,6 +204,7 @@ def search_website_items(query="", item_group=""):
     return {
         "success": True,
         "data": products,
+        "next_cursor": next_cursor,
     }
 
 @frappe.whitelist(allow_guest=True)
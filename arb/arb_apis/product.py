@@ -1,5 +1,20 @@
 import frappe
 
+from arb.arb_apis.utils.item_lookup import get_price_map
+
+# Website Item fields shown on the product page; child tables are fetched separately
+_WEBSITE_ITEM_FIELDS = [
+    "name",
+    "item_code",
+    "published",
+    "web_item_name",
+    "route",
+    "item_group",
+    "stock_uom",
+    "short_description",
+    "web_long_description",
+]
+
 
 @frappe.whitelist(allow_guest=True)
 def get_detail(route=None, item_code=None):
@@ -8,17 +23,18 @@ def get_detail(route=None, item_code=None):
     if not route and not item_code:
         return {"success": False, "error": "route or item_code is required"}
 
-    # Fetch Website Item using route OR item_code
-    try:
-        if route:
-            website_item = frappe.get_doc("Website Item", {"route": route})
-        else:
-            website_item = frappe.get_doc("Website Item", {"item_code": item_code})
-    except frappe.DoesNotExistError:
+    # Fetch Website Item using route OR item_code, without loading its child tables
+    website_item = frappe.db.get_value(
+        "Website Item",
+        {"route": route} if route else {"item_code": item_code},
+        _WEBSITE_ITEM_FIELDS,
+        as_dict=True,
+    )
+    if not website_item:
         return {"success": False, "error": "Item not found"}
 
     # Ensure item is published
-    if not getattr(website_item, "published", 0):
+    if not website_item.published:
         return {"success": False, "error": "Item not published"}
 
     # Fetch Item master
@@ -40,11 +56,20 @@ def get_detail(route=None, item_code=None):
             "label": spec.label,
             "description": spec.description,
         }
-        for spec in website_item.website_specifications
+        for spec in frappe.get_all(
+            "Item Website Specification",
+            filters={
+                "parent": website_item.name,
+                "parenttype": "Website Item",
+                "parentfield": "website_specifications",
+            },
+            fields=["label", "description"],
+            order_by="idx asc",
+        )
     ]
 
-    # Main product image fallback
-    product_image = frappe.db.get_value("Item", website_item.item_code, "image") or ""
+    # Main product image fallback, from the Item master already loaded above
+    product_image = item.image or ""
 
     variants = []
 
@@ -56,9 +81,12 @@ def get_detail(route=None, item_code=None):
                 "variant_of": website_item.item_code,
                 "disabled": 0,
             },
-            fields=["name", "item_code", "item_name"],
+            fields=["name", "item_code", "item_name", "image"],
         )
 
+        # Selling prices of all variants in one query
+        variant_prices = get_price_map([variant.item_code for variant in variant_items])
+
         for variant in variant_items:
             # Check if variant is published on website
             variant_website_item = frappe.db.get_value(
@@ -75,14 +103,7 @@ def get_detail(route=None, item_code=None):
                 continue
 
             # Variant price
-            variant_price = (
-                frappe.db.get_value(
-                    "Item Price",
-                    {"item_code": variant.item_code, "selling": 1},
-                    "price_list_rate",
-                )
-                or 0
-            )
+            variant_price = variant_prices.get(variant.item_code) or 0
 
             # Variant attributes (parent = Item.name)
             attributes = frappe.get_all(
@@ -92,11 +113,7 @@ def get_detail(route=None, item_code=None):
             )
 
             # Variant image fallback
-            variant_image = (
-                variant_website_item.website_image
-                or frappe.db.get_value("Item", variant.name, "image")
-                or ""
-            )
+            variant_image = variant_website_item.website_image or variant.image or ""
 
             variants.append(
                 {
@@ -2,8 +2,7 @@ import json
 
 import frappe
 from frappe import _
-from frappe.model.mapper import get_mapped_doc
-from frappe.utils import add_days, cint, flt, getdate, now_datetime, nowdate
+from frappe.utils import cint, flt
 
 
 def resolve_totals(doc):
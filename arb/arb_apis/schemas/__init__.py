@@ -2,6 +2,7 @@
 Pydantic schemas for API validation
 """
 
+from arb.arb_apis.schemas.address_schemas import CreateAddressData
 from arb.arb_apis.schemas.auth_schemas import (
     CheckUserExistsRequest,
     CompleteSignupRequest,
@@ -21,6 +22,7 @@ from arb.arb_apis.schemas.auth_schemas import (
 __all__ = [
     "CheckUserExistsRequest",
     "CompleteSignupRequest",
+    "CreateAddressData",
     "ForgotPasswordRequest",
     "LoginRequest",
     "RefreshTokenRequest",
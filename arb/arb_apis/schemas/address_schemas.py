@@ -0,0 +1,23 @@
+"""
+Pydantic schemas for address API validation
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CreateAddressData(BaseModel):
+    """Address fields accepted when creating an address"""
+
+    model_config = ConfigDict(extra="ignore", coerce_numbers_to_str=True)
+
+    address_title: str | None = Field(None, max_length=140)
+    address_type: str = Field("Billing", description="Address Type select option")
+    address_line1: str = Field(..., min_length=1, max_length=240)
+    address_line2: str | None = Field(None, max_length=240)
+    city: str = Field(..., min_length=1, max_length=140)
+    state: str | None = Field(None, max_length=140)
+    country: str = Field(..., min_length=1, description="Country name")
+    pincode: str | None = Field(None, max_length=140)
+    phone: str | None = Field(None, max_length=140)
+    is_primary_address: int = Field(0, ge=0, le=1)
+    is_shipping_address: int = Field(0, ge=0, le=1)
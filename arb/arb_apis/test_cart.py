@@ -0,0 +1,106 @@
+# Copyright (c) 2025, Kerol Systems and Contributors
+# See license.txt
+
+from unittest.mock import call, patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from arb.arb_apis import cart
+
+ITEM_DOCTYPE = "Quick Order Item"
+ROW_FILTERS = {"parent": "QO-0001", "parenttype": "Quick Order", "parentfield": "table_effn"}
+CART_ROWS = [
+    frappe._dict(name="row-a", item_code="ITEM-A", qty=2, idx=1),
+    frappe._dict(name="row-b", item_code="ITEM-B", qty=1, idx=2),
+]
+
+
+@patch.object(cart, "_get_cart_item_doctype", return_value=ITEM_DOCTYPE)
+class TestCartItemWrites(FrappeTestCase):
+    """The cart's item rows are written one by one, without saving the whole Quick Order"""
+
+    def test_update_rows(self, _item_doctype):
+        item_details = {
+            "ITEM-C": frappe._dict(item_code="ITEM-C", web_item_name="Item C", stock_uom="Nos"),
+        }
+        item_updates = [
+            {"item_code": "ITEM-A", "qty": 5},
+            {"item_code": "ITEM-B", "qty": 0},
+            {"item_code": "ITEM-C", "qty": 3},
+        ]
+
+        with (
+            patch.object(frappe, "get_all", return_value=CART_ROWS) as get_all,
+            patch.object(frappe.db, "set_value") as set_value,
+            patch.object(frappe.db, "delete") as delete,
+            patch.object(frappe, "get_doc") as get_doc,
+        ):
+            cart._apply_cart_item_updates("QO-0001", item_updates, item_details)
+
+        self.assertEqual(get_all.call_args.kwargs["filters"], ROW_FILTERS)
+        set_value.assert_called_once_with(ITEM_DOCTYPE, "row-a", "qty", 5)
+        delete.assert_called_once_with(ITEM_DOCTYPE, {"name": "row-b"})
+        get_doc.assert_called_once_with(
+            {
+                "doctype": ITEM_DOCTYPE,
+                **ROW_FILTERS,
+                "idx": 3,
+                "item_code": "ITEM-C",
+                "item_name": "Item C",
+                "qty": 3,
+                "uom": "Nos",
+            }
+        )
+        self.assertEqual(get_doc.return_value.mock_calls, [call.db_insert()])
+
+    def test_unchanged_rows_untouched(self, _item_doctype):
+        with (
+            patch.object(frappe, "get_all", return_value=CART_ROWS),
+            patch.object(frappe.db, "set_value") as set_value,
+            patch.object(frappe.db, "delete") as delete,
+            patch.object(frappe, "get_doc") as get_doc,
+        ):
+            cart._apply_cart_item_updates(
+                "QO-0001",
+                [{"item_code": "ITEM-A", "qty": 2}, {"item_code": "ITEM-C", "qty": 0}],
+                {},
+            )
+
+        set_value.assert_not_called()
+        delete.assert_not_called()
+        get_doc.assert_not_called()
+
+    def test_clear_cart(self, _item_doctype):
+        with (
+            patch.object(cart, "_get_cart_for_customer", return_value=frappe._dict(name="QO-0001")),
+            patch.object(frappe.db, "set_value") as set_value,
+            patch.object(frappe.db, "delete") as delete,
+        ):
+            response = cart.clear_cart.__wrapped__("CUST-0001")
+
+        self.assertTrue(response["success"])
+        delete.assert_called_once_with(ITEM_DOCTYPE, ROW_FILTERS)
+        set_value.assert_called_once()
+        self.assertEqual(set_value.call_args.args[:2], ("Quick Order", "QO-0001"))
+
+    def test_clear_missing_cart(self, _item_doctype):
+        with (
+            patch.object(cart, "_get_cart_for_customer", return_value=None),
+            self.assertRaises(frappe.ValidationError),
+        ):
+            cart.clear_cart.__wrapped__("CUST-0001")
+
+    def test_unowned_address_rejected(self, _item_doctype):
+        with (
+            patch.object(cart, "get_owned_addresses", return_value={"ADDR-OWN"}),
+            patch.object(frappe.db, "set_value") as set_value,
+            self.assertRaises(frappe.PermissionError),
+        ):
+            cart.update_cart.__wrapped__(
+                "CUST-0001",
+                items=[{"item_code": "ITEM-A", "qty": 1}],
+                shipping_address="ADDR-OTHER",
+            )
+
+        set_value.assert_not_called()
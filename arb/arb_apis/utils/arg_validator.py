@@ -0,0 +1,70 @@
+"""
+Declarative argument validation for whitelisted endpoints
+"""
+
+import inspect
+from functools import wraps
+
+import frappe
+from frappe import _
+
+
+def _doc_exists(doctype: str, name: str) -> bool:
+    """frappe.db.exists memoized for the lifetime of the current request"""
+    cache = getattr(frappe.local, "arb_doc_exists_cache", None)
+    if cache is None:
+        cache = frappe.local.arb_doc_exists_cache = {}
+
+    key = (doctype, name)
+    if key not in cache:
+        cache[key] = bool(frappe.db.exists(doctype, name))
+    return cache[key]
+
+
+def _parse_rules(spec: str) -> list[tuple[str, str]]:
+    rules = []
+    for rule in spec.split("|"):
+        check, _sep, option = rule.partition(":")
+        if check not in ("required", "exists") or (check == "exists" and not option):
+            raise ValueError(f"Invalid argument rule: {rule}")
+        rules.append((check, option))
+    return rules
+
+
+def validate_args(**specs: str):
+    """
+    Decorator to validate endpoint arguments from a declarative spec
+
+    Supported rules, separated by "|":
+        required          the argument must be truthy
+        exists:<DocType>  the argument must name an existing document
+
+    Usage:
+        @frappe.whitelist(allow_guest=True)
+        @require_jwt_auth
+        @validate_args(customer="required|exists:Customer", address_name="required")
+        def update_address(customer, address_name, address_data):
+            ...
+    """
+    rules = {arg: _parse_rules(spec) for arg, spec in specs.items()}
+
+    def decorator(f):
+        signature = inspect.signature(f)
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+
+            for arg, checks in rules.items():
+                value = arguments.get(arg)
+                for check, option in checks:
+                    if check == "required" and not value:
+                        frappe.throw(_("{0} is required").format(arg), frappe.ValidationError)
+                    elif check == "exists" and value and not _doc_exists(option, value):
+                        frappe.throw(_("{0} not found").format(_(option)), frappe.ValidationError)
+
+            return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,7 @@
 import hashlib
+import hmac
 import random
-import re
+import threading
 import time
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
@@ -15,8 +16,17 @@ from arb.arb_apis.utils.frappe_configs import (
     get_jwt_expiry_minutes,
     get_jwt_refresh_expiry_days,
     get_jwt_secret,
+    get_otp_pepper,
 )
 
+# Verified JWT payloads are reused for a few seconds so replayed bearer tokens skip
+# signature verification. Only successful verifications are stored.
+JWT_CACHE_TTL_SECONDS = 10
+JWT_CACHE_MAX_SIZE = 10000
+
+_jwt_cache: dict[bytes, tuple[float, dict]] = {}
+_jwt_cache_lock = threading.Lock()
+
 
 def generate_jwt_token(user_email: str) -> str:
     """
@@ -55,6 +65,8 @@ def generate_refresh_token(user_email: str) -> str:
     payload = {
         "email": user_email,
         "type": "refresh",
+        # Identifies the token in the logout blacklist
+        "jti": frappe.generate_hash(length=16),
         "iat": datetime.timestamp(datetime.now(timezone.utc)),
         "exp": datetime.timestamp(
             datetime.now(timezone.utc) + timedelta(days=get_jwt_refresh_expiry_days())
@@ -82,6 +94,51 @@ def verify_jwt_token(token: str) -> dict | None:
     return None
 
 
+def _jwt_cache_key(token: str) -> bytes:
+    # Tokens are site specific: the same process may serve several sites.
+    # The key only indexes an in-process cache, so a short BLAKE2 digest is enough.
+    return hashlib.blake2b(f"{frappe.local.site}:{token}".encode(), digest_size=16).digest()
+
+
+def verify_jwt_token_cached(token: str) -> dict | None:
+    """
+    verify_jwt_token with a short-lived in-process cache
+
+    :param token: JWT token
+    :type token: str
+    :return: Payload if token is valid, else None
+    :rtype: dict | None
+    """
+    key = _jwt_cache_key(token)
+    now = time.time()
+
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(key)
+
+    if cached and cached[0] > now:
+        payload = cached[1]
+    else:
+        payload = verify_jwt_token(token)
+        if not payload:
+            return None
+
+        expires_at = min(now + JWT_CACHE_TTL_SECONDS, payload.get("exp", now))
+        with _jwt_cache_lock:
+            if len(_jwt_cache) >= JWT_CACHE_MAX_SIZE:
+                for stale_key in [k for k, (exp, _p) in _jwt_cache.items() if exp <= now]:
+                    del _jwt_cache[stale_key]
+                if len(_jwt_cache) >= JWT_CACHE_MAX_SIZE:
+                    # Still full: evict the oldest entry
+                    del _jwt_cache[next(iter(_jwt_cache))]
+            _jwt_cache[key] = (expires_at, payload)
+
+    # Logout can revoke a refresh token at any time, so this is never served from the cache
+    if payload.get("type") == "refresh" and is_refresh_token_blacklisted(token, payload):
+        return None
+
+    return payload
+
+
 def require_jwt_auth(f):
     """
     Decorator to require JWT authentication for an endpoint.
@@ -106,7 +163,7 @@ def require_jwt_auth(f):
             }
 
         # Verify token
-        payload = verify_jwt_token(token)
+        payload = verify_jwt_token_cached(token)
         if not payload:
             frappe.local.response.http_status_code = 401
             return {
@@ -114,12 +171,9 @@ def require_jwt_auth(f):
                 "status": 401,
             }
 
-        try:
-            user = frappe.get_doc("User", payload.get("email"))
-        except frappe.DoesNotExistError:
-            user = None
-
-        if not user or user.enabled != 1:
+        # The token's email is the User name; only the enabled flag is needed
+        user = payload.get("email")
+        if not user or frappe.db.get_value("User", user, "enabled") != 1:
             frappe.local.response.http_status_code = 401
             return {
                 "message": "User not found or disabled",
@@ -127,8 +181,8 @@ def require_jwt_auth(f):
             }
 
         # Set current user context
-        frappe.session.user = user.name
-        frappe.set_user(user.name)
+        frappe.session.user = user
+        frappe.set_user(user)
 
         return f(*args, **kwargs)
 
@@ -154,19 +208,39 @@ def generate_otp(length: int = 6) -> str:
 
 
 def hash_otp(otp: str) -> str:
-    return hashlib.sha256(otp.encode()).hexdigest()
+    # Keyed with a per-site pepper so OTP hashes in a Redis dump can't be brute-forced
+    return hmac.new(get_otp_pepper().encode(), otp.encode(), hashlib.sha256).hexdigest()
+
 
+def _refresh_blacklist_key(refresh_token: str, payload: dict) -> str:
+    # Tokens issued before refresh tokens carried a jti are keyed by their hash
+    jti = payload.get("jti") or hashlib.sha256(refresh_token.encode()).hexdigest()
+    return f"jwt_bl:{jti}"
 
-def blacklist_refresh_token(refresh_token: str):
+
+def blacklist_refresh_token(refresh_token: str, payload: dict | None = None):
     """
     Blacklist refresh token until it expires
+
+    :param payload: The token's already verified payload, if at hand
     """
+    if payload is None:
+        payload = jwt.decode(refresh_token, options={"verify_signature": False})
+
+    expires_in = int(payload.get("exp", 0) - time.time())
+    if expires_in <= 0:
+        # Already expired, nothing to revoke
+        return
+
     frappe.cache().set_value(
-        f"blacklist_refresh_{refresh_token}",
+        _refresh_blacklist_key(refresh_token, payload),
         True,
-        expires_in_sec=7 * 24 * 60 * 60,  # match refresh expiry
+        expires_in_sec=expires_in,
     )
 
 
-def is_refresh_token_blacklisted(refresh_token: str) -> bool:
-    return bool(frappe.cache().get_value(f"blacklist_refresh_{refresh_token}"))
+def is_refresh_token_blacklisted(refresh_token: str, payload: dict | None = None) -> bool:
+    if payload is None:
+        payload = jwt.decode(refresh_token, options={"verify_signature": False})
+
+    return bool(frappe.cache().get_value(_refresh_blacklist_key(refresh_token, payload)))
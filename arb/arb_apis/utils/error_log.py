@@ -0,0 +1,14 @@
+import frappe
+
+
+def log_error_async(title):
+    """
+    Record the current traceback as an Error Log from a background worker,
+    so failing requests don't also wait on the Error Log insert.
+    """
+    frappe.enqueue(
+        frappe.log_error,
+        queue="short",
+        title=title,
+        message=frappe.get_traceback(),
+    )
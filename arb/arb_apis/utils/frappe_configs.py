@@ -7,6 +7,7 @@ ARB_JWT_EXPIRY_MINUTES = "arb_jwt_expiry_minutes"
 ARB_JWT_REFRESH_EXPIRY_DAYS = "arb_jwt_refresh_expiry_days"
 ARB_OTP_RESEND_LIMIT_PER_HOUR = "arb_otp_resend_limit_per_hour"
 ARB_CACHE_TIMEOUT_MINUTES = "arb_cache_timeout_minutes"
+ARB_OTP_PEPPER = "arb_otp_pepper"
 
 
 def get_jwt_secret() -> str:
@@ -35,3 +36,8 @@ def get_otp_resend_limit_per_hour() -> int:
 
 def get_cache_timeout_minutes() -> int:
     return frappe.conf.get(ARB_CACHE_TIMEOUT_MINUTES, 15)
+
+
+def get_otp_pepper() -> str:
+    # Falls back to the JWT secret so existing sites keep a server-side secret
+    return frappe.conf.get(ARB_OTP_PEPPER) or get_jwt_secret()
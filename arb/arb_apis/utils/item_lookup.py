@@ -0,0 +1,50 @@
+import frappe
+
+
+def get_website_items_by_name(names, fields):
+    """Website Items keyed by name, fetched in one query"""
+    names = list({name for name in names if name})
+    if not names:
+        return {}
+
+    if "name" not in fields:
+        fields = ["name", *fields]
+
+    return {
+        website_item.name: website_item
+        for website_item in frappe.get_all("Website Item", filters={"name": ["in", names]}, fields=fields)
+    }
+
+
+def get_items_by_code(item_codes, fields):
+    """Item master fields keyed by item code, fetched in one query"""
+    item_codes = list({item_code for item_code in item_codes if item_code})
+    if not item_codes:
+        return {}
+
+    if "name" not in fields:
+        fields = ["name", *fields]
+
+    return {
+        item.name: item
+        for item in frappe.get_all("Item", filters={"name": ["in", item_codes]}, fields=fields)
+    }
+
+
+def get_price_map(item_codes, price_list=None):
+    """Latest selling price of each item code, fetched in one query; unpriced codes are left out"""
+    item_codes = list({item_code for item_code in item_codes if item_code})
+    if not item_codes:
+        return {}
+
+    filters = {"item_code": ["in", item_codes], "selling": 1}
+    if price_list:
+        filters["price_list"] = price_list
+
+    price_map = {}
+    # Newest first, matching the get_value lookups this replaces
+    for item_price in frappe.get_all(
+        "Item Price", filters=filters, fields=["item_code", "price_list_rate"], order_by="modified desc"
+    ):
+        price_map.setdefault(item_price.item_code, item_price.price_list_rate)
+    return price_map
@@ -0,0 +1,148 @@
+"""
+Redis storage for pending OTPs
+
+Each OTP is a Redis hash so counters and flags can be updated field by field
+instead of rewriting the whole entry.
+"""
+
+import json
+
+import frappe
+from frappe.utils import cint
+
+# Count a resend against the limit and store the new OTP in one round-trip.
+# ARGV[3:] are the field/value pairs of the new entry.
+# Returns the resend count, or -1 when the limit is exceeded.
+_STORE_OTP_LUA = """
+local resend_attempts = 0
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    resend_attempts = (tonumber(redis.call('HGET', KEYS[1], 'resend_attempts')) or 0) + 1
+    if resend_attempts > tonumber(ARGV[2]) then
+        return -1
+    end
+    redis.call('DEL', KEYS[1])
+end
+redis.call('HSET', KEYS[1], 'resend_attempts', resend_attempts, unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return resend_attempts
+"""
+
+# Check an OTP hash and record the attempt in one round-trip, so concurrent guesses
+# can't race on the attempts counter. Returns {status[, fields]}.
+_VERIFY_OTP_LUA = """
+local otp = redis.call('HMGET', KEYS[1], 'otp_hash', 'attempts')
+if not otp[1] then
+    return {'missing'}
+end
+if (tonumber(otp[2]) or 0) >= tonumber(ARGV[2]) then
+    return {'locked'}
+end
+if otp[1] ~= ARGV[1] then
+    redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+    return {'invalid'}
+end
+redis.call('HSET', KEYS[1], 'verified', 1)
+return {'verified', redis.call('HGETALL', KEYS[1])}
+"""
+
+OTP_MAX_ATTEMPTS = 3
+
+_INT_FIELDS = ("attempts", "resend_attempts")
+
+_scripts = {}
+
+
+def _otp_key(purpose, identifier):
+    # Pending OTPs used to be pickled strings under "otp_..."; hashes get their own
+    # prefix so a leftover string key can't hit the scripts with WRONGTYPE after a deploy
+    return frappe.cache().make_key(f"otp_h_{purpose}_{identifier}")
+
+
+def _run_script(source, key, *args):
+    cache = frappe.cache()
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = cache.register_script(source)
+    return script(keys=[key], args=args, client=cache)
+
+
+def _pipeline():
+    # frappe's cache wrapper pickles hash values; its pipelines issue the plain commands
+    return frappe.cache().pipeline()
+
+
+def _encode(otp_data):
+    """Flatten OTP data into hash field/value pairs"""
+    fields = {}
+    for field, value in otp_data.items():
+        if field == "extra":
+            value = json.dumps(value or {})
+        elif isinstance(value, bool):
+            value = int(value)
+        fields[field] = value
+    return fields
+
+
+def _decode(pairs):
+    """Build OTP data back from hash field/value pairs"""
+    otp_data = {frappe.safe_decode(field): frappe.safe_decode(value) for field, value in pairs}
+    for field in _INT_FIELDS:
+        otp_data[field] = cint(otp_data.get(field))
+    otp_data["verified"] = bool(cint(otp_data.get("verified")))
+    otp_data["extra"] = json.loads(otp_data.get("extra") or "{}")
+    return otp_data
+
+
+def store_otp(purpose, identifier, otp_data, expires_in_sec, resend_limit):
+    """Store a new OTP, returning False if the resend limit was exceeded"""
+    fields = _encode(otp_data)
+    resend_attempts = _run_script(
+        _STORE_OTP_LUA,
+        _otp_key(purpose, identifier),
+        expires_in_sec,
+        resend_limit,
+        *[item for pair in fields.items() for item in pair],
+    )
+    return resend_attempts >= 0
+
+
+def verify_otp(purpose, identifier, otp_hash, max_attempts=OTP_MAX_ATTEMPTS):
+    """
+    Check otp_hash against the pending OTP and count the attempt.
+
+    Returns (status, otp_data) where status is "missing", "locked", "invalid" or
+    "verified"; otp_data is only set when verified.
+    """
+    result = _run_script(_VERIFY_OTP_LUA, _otp_key(purpose, identifier), otp_hash, max_attempts)
+    status = frappe.safe_decode(result[0])
+    if len(result) < 2:
+        return status, None
+
+    fields = result[1]
+    return status, _decode(zip(fields[::2], fields[1::2], strict=True))
+
+
+def get_otp(purpose, identifier):
+    """Return the pending OTP data, or None if there is none"""
+    pipe = _pipeline()
+    pipe.hgetall(_otp_key(purpose, identifier))
+    (fields,) = pipe.execute()
+    return _decode(fields.items()) if fields else None
+
+
+def increment_otp_attempts(purpose, identifier):
+    frappe.cache().hincrby(_otp_key(purpose, identifier), "attempts", 1)
+
+
+def update_otp(purpose, identifier, expires_in_sec=None, **fields):
+    """Set individual fields on the pending OTP, optionally resetting its expiry"""
+    key = _otp_key(purpose, identifier)
+    pipe = _pipeline()
+    pipe.hset(key, mapping=_encode(fields))
+    if expires_in_sec:
+        pipe.expire(key, expires_in_sec)
+    pipe.execute()
+
+
+def delete_otp(purpose, identifier):
+    frappe.cache().delete(_otp_key(purpose, identifier))
@@ -0,0 +1,37 @@
+"""
+Keyset pagination over (modified, name)
+
+A cursor carries the sort key of the last row of a page, so the next page is an
+index range read instead of an OFFSET scan that discards every earlier row.
+"""
+
+import json
+
+import frappe
+from frappe import _
+
+# Rows strictly after the cursor in "modified DESC, name DESC" order; alias is the table alias
+_KEYSET_CONDITION = (
+    "({alias}.modified < %(cursor_modified)s"
+    " OR ({alias}.modified = %(cursor_modified)s AND {alias}.name < %(cursor_name)s))"
+)
+
+
+def encode_cursor(row):
+    """Cursor pointing just after row, which must carry modified and name"""
+    return json.dumps([str(row.modified), row.name])
+
+
+def decode_cursor(cursor):
+    """Return (modified, name) from a cursor sent back by the client"""
+    try:
+        modified, name = frappe.parse_json(cursor)
+    except (TypeError, ValueError):
+        frappe.throw(_("Invalid cursor"), frappe.ValidationError)
+    return modified, name
+
+
+def keyset_condition(cursor, alias, values):
+    """SQL condition for the rows after cursor, adding its parameters to values"""
+    values["cursor_modified"], values["cursor_name"] = decode_cursor(cursor)
+    return _KEYSET_CONDITION.format(alias=alias)
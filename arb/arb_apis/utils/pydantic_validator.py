@@ -6,12 +6,16 @@ from functools import wraps
 from typing import TypeVar
 
 import frappe
-from frappe import _
 from pydantic import BaseModel, ValidationError
 
 T = TypeVar("T", bound=BaseModel)
 
 
+def format_validation_error(error: ValidationError) -> str:
+    """Flatten Pydantic validation errors into a single message"""
+    return "; ".join(f"{' -> '.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in error.errors())
+
+
 def validate_request(schema: type[T]):
     """
     Decorator to validate Frappe API requests using Pydantic schemas
@@ -39,20 +43,10 @@ def validate_request(schema: type[T]):
             try:
                 validated_data = schema(**request_data)
             except ValidationError as e:
-                # Format Pydantic validation errors
-                errors = []
-
-                for error in e.errors():
-                    field = " -> ".join(str(loc) for loc in error["loc"])
-                    message = error["msg"]
-                    errors.append(f"{field}: {message}")
-
-                error_message = "; ".join(errors)
-
                 frappe.local.response.http_status_code = 400
                 return {
                     "status": "error",
-                    "message": error_message,
+                    "message": format_validation_error(e),
                     "validation_errors": [
                         {
                             "field": " -> ".join(str(loc) for loc in err["loc"]),
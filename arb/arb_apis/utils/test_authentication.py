@@ -0,0 +1,40 @@
+# Copyright (c) 2025, Kerol Systems and Contributors
+# See license.txt
+
+from frappe.tests.utils import FrappeTestCase
+
+from arb.arb_apis.utils.authentication import (
+    _jwt_cache,
+    _jwt_cache_key,
+    blacklist_refresh_token,
+    generate_jwt_token,
+    generate_refresh_token,
+    verify_jwt_token_cached,
+)
+
+EMAIL = "test@example.com"
+
+
+class TestJWTCache(FrappeTestCase):
+    def test_blacklisted_refresh_token_bypasses_cache(self):
+        token = generate_refresh_token(EMAIL)
+        self.assertEqual(verify_jwt_token_cached(token)["email"], EMAIL)
+        self.assertIn(_jwt_cache_key(token), _jwt_cache)
+
+        blacklist_refresh_token(token)
+
+        # Still cached in-process, but the blacklist is checked on every call
+        self.assertIn(_jwt_cache_key(token), _jwt_cache)
+        self.assertIsNone(verify_jwt_token_cached(token))
+
+    def test_other_refresh_tokens_unaffected(self):
+        blacklist_refresh_token(generate_refresh_token(EMAIL))
+        self.assertEqual(verify_jwt_token_cached(generate_refresh_token(EMAIL))["email"], EMAIL)
+
+    def test_access_token(self):
+        token = generate_jwt_token(EMAIL)
+        self.assertEqual(verify_jwt_token_cached(token)["email"], EMAIL)
+        self.assertEqual(verify_jwt_token_cached(token)["email"], EMAIL)
+
+    def test_invalid_token(self):
+        self.assertIsNone(verify_jwt_token_cached("not-a-token"))
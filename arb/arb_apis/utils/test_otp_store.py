@@ -0,0 +1,54 @@
+# Copyright (c) 2025, Kerol Systems and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from arb.arb_apis.utils.otp_store import delete_otp, store_otp, verify_otp
+
+PURPOSE = "test"
+
+
+class TestOTPStore(FrappeTestCase):
+    def setUp(self):
+        self.identifier = frappe.generate_hash(length=10)
+
+    def tearDown(self):
+        delete_otp(PURPOSE, self.identifier)
+
+    def store(self, otp_hash="right", resend_limit=2):
+        return store_otp(
+            PURPOSE,
+            self.identifier,
+            {"otp_hash": otp_hash, "extra": {"email": "test@example.com"}},
+            expires_in_sec=60,
+            resend_limit=resend_limit,
+        )
+
+    def test_resend_limit(self):
+        self.assertTrue(self.store())
+        self.assertTrue(self.store())
+        self.assertTrue(self.store())
+        self.assertFalse(self.store())
+
+    def test_lockout(self):
+        self.store()
+        for _i in range(3):
+            self.assertEqual(verify_otp(PURPOSE, self.identifier, "wrong", max_attempts=3)[0], "invalid")
+
+        # Even the right OTP is refused once the attempts are used up
+        self.assertEqual(verify_otp(PURPOSE, self.identifier, "right", max_attempts=3)[0], "locked")
+
+    def test_verify(self):
+        self.store()
+        self.assertEqual(verify_otp(PURPOSE, self.identifier, "wrong")[0], "invalid")
+
+        status, otp_data = verify_otp(PURPOSE, self.identifier, "right")
+        self.assertEqual(status, "verified")
+        self.assertTrue(otp_data["verified"])
+        self.assertEqual(otp_data["attempts"], 1)
+        self.assertEqual(otp_data["resend_attempts"], 0)
+        self.assertEqual(otp_data["extra"], {"email": "test@example.com"})
+
+    def test_verify_missing(self):
+        self.assertEqual(verify_otp(PURPOSE, self.identifier, "right"), ("missing", None))
@@ -0,0 +1,26 @@
+# Copyright (c) 2025, Kerol Systems and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from arb.arb_apis.utils.pagination import decode_cursor, encode_cursor, keyset_condition
+
+
+class TestPagination(FrappeTestCase):
+    def test_round_trip(self):
+        row = frappe._dict(modified="2025-01-02 03:04:05.000006", name="WEB-ITM-0001")
+        self.assertEqual(decode_cursor(encode_cursor(row)), ("2025-01-02 03:04:05.000006", "WEB-ITM-0001"))
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-json", "[1]", "5", '["a", "b", "c"]'):
+            with self.subTest(cursor=cursor), self.assertRaises(frappe.ValidationError):
+                decode_cursor(cursor)
+
+    def test_keyset_condition(self):
+        values = {}
+        condition = keyset_condition(
+            encode_cursor(frappe._dict(modified="2025-01-01", name="X")), "wi", values
+        )
+        self.assertIn("wi.modified < %(cursor_modified)s", condition)
+        self.assertEqual(values, {"cursor_modified": "2025-01-01", "cursor_name": "X"})
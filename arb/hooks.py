@@ -146,6 +146,39 @@ web_include_js = ["/assets/arb/js/google_analytics.js"]
 # 	}
 # }
 
+doc_events = {
+    "Available Warehouse": {
+        "on_update": "arb.arb_apis.cart.clear_default_warehouse_cache",
+        "on_trash": "arb.arb_apis.cart.clear_default_warehouse_cache",
+    },
+    "Store Link Shipping Process": {
+        "on_update": "arb.arb_apis.cart.clear_shipping_process_cache",
+        "on_trash": "arb.arb_apis.cart.clear_shipping_process_cache",
+        "after_rename": "arb.arb_apis.cart.clear_shipping_process_cache",
+    },
+    "Website Item": {
+        "on_update": [
+            "arb.arb_apis.cart.clear_website_item_cache",
+            "arb.arb_apis.doctype.homepages.clear_homepage_cache",
+        ],
+        "on_trash": [
+            "arb.arb_apis.cart.clear_website_item_cache",
+            "arb.arb_apis.doctype.homepages.clear_homepage_cache",
+        ],
+    },
+    "Homepages": {
+        "on_update": "arb.arb_apis.doctype.homepages.clear_homepage_cache",
+    },
+    # Homepage responses show Item images and MOQs and selling prices
+    "Item": {
+        "on_update": "arb.arb_apis.doctype.homepages.clear_homepage_cache",
+    },
+    "Item Price": {
+        "on_update": "arb.arb_apis.doctype.homepages.clear_homepage_cache",
+        "on_trash": "arb.arb_apis.doctype.homepages.clear_homepage_cache",
+    },
+}
+
 # Scheduled Tasks
 # ---------------
 
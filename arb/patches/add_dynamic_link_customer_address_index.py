@@ -0,0 +1,10 @@
+import frappe
+
+
+def execute():
+    """Index the Dynamic Link columns used to look up a customer's addresses"""
+    frappe.db.add_index(
+        "Dynamic Link",
+        ["link_doctype", "link_name", "parenttype", "parent"],
+        index_name="dl_customer_addr_idx",
+    )
@@ -0,0 +1,10 @@
+import frappe
+
+
+def execute():
+    """Covering index for the latest selling price of an item"""
+    frappe.db.add_index(
+        "Item Price",
+        ["item_code", "selling", "modified", "price_list_rate"],
+        index_name="item_price_selling_idx",
+    )
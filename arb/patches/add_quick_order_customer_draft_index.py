@@ -0,0 +1,10 @@
+import frappe
+
+
+def execute():
+    """Index the Quick Order columns used to find a customer's latest draft cart"""
+    frappe.db.add_index(
+        "Quick Order",
+        ["customer", "docstatus", "modified"],
+        index_name="qo_customer_draft_idx",
+    )
@@ -0,0 +1,12 @@
+import frappe
+
+
+def execute():
+    """Index Website Item codes for the prefix matches in search_website_items"""
+    # The Website Item DocType may already index item_code; a second index would only cost writes
+    if frappe.db.sql(
+        "SHOW INDEX FROM `tabWebsite Item` WHERE Column_name = 'item_code' AND Seq_in_index = 1"
+    ):
+        return
+
+    frappe.db.add_index("Website Item", ["item_code"], index_name="website_item_code_idx")
@@ -0,0 +1,11 @@
+import frappe
+
+
+def execute():
+    """FULLTEXT index on the Website Item columns matched by search_website_items"""
+    if frappe.db.sql("SHOW INDEX FROM `tabWebsite Item` WHERE Key_name = 'website_item_search_ft'"):
+        return
+
+    frappe.db.sql_ddl(
+        "ALTER TABLE `tabWebsite Item` ADD FULLTEXT INDEX website_item_search_ft (web_item_name, item_code)"
+    )